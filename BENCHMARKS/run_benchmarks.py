@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Cross-Project Benchmark Suite
+Times every pipeline stage (ingest, transform, aggregate, render) on
+deterministic synthetic data, tracks peak memory, and stores results as JSON
+so runs can be compared over time. Runs entirely offline.
+
+Usage:
+    python run_benchmarks.py                      # all pipelines, small + medium
+    python run_benchmarks.py --sizes large --pipelines nba
+    python run_benchmarks.py --compare            # diff against the previous run
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'NBADATA'))
+sys.path.insert(0, os.path.join(HERE, '..', 'BITCOIN'))
+
+import synthetic_data
+
+RESULTS_DIR = os.path.join(HERE, 'results')
+
+
+# PIPELINES
+# Each pipeline is a list of (stage, function); a stage receives the previous stage's output.
+
+def nba_pipeline():
+    import nba_game_log
+    import nba_team_visualizer as viz
+
+    def ingest(result_set):
+        return pd.DataFrame(result_set['rowSet'], columns=result_set['headers'])
+
+    def transform(games_df):
+        return nba_game_log.normalize_game_log(games_df)
+
+    def aggregate(games_log):
+        names = dict(synthetic_data.NBA_TEAMS)
+        return nba_game_log.team_records(games_log, names=names)
+
+    def render(all_teams_data):
+        return viz.build_html(all_teams_data, viz.team_name)
+
+    return [('ingest', ingest), ('transform', transform), ('aggregate', aggregate), ('render', render)]
+
+
+def bitcoin_pipeline():
+    import bitcoin_analysis_notebook as btc
+
+    def render(candlestick_data):
+        return btc.candlestick_figure(candlestick_data).to_html(include_plotlyjs='cdn')
+
+    return [('ingest', btc.prices_frame), ('transform', btc.add_dates), ('aggregate', btc.ohlc), ('render', render)]
+
+
+def matrix_pipeline():
+    import matrix_engine
+
+    window, step = 250, 5
+
+    def transform(returns):
+        return returns, matrix_engine.rolling_corr(returns, window, step)
+
+    def aggregate(value):
+        returns, _ = value
+        cov, _ = matrix_engine.ledoit_wolf(returns[-window:])
+        return {'pca': matrix_engine.pca(cov, n_components=3),
+                'weights': matrix_engine.min_variance_weights(cov)}
+
+    return [('ingest', matrix_engine.returns_from_prices), ('transform', transform), ('aggregate', aggregate)]
+
+
+def ai_jobs_pipeline():
+    # The AI-jobs analysis only exists as notebook cells, which cannot be imported;
+    # these stages mirror those cells
+    def ingest(csv_text):
+        return pd.read_csv(StringIO(csv_text))
+
+    def transform(df):
+        df['posting_date'] = pd.to_datetime(df['posting_date'])
+        df['application_deadline'] = pd.to_datetime(df['application_deadline'])
+        df['days_open'] = (df['application_deadline'] - df['posting_date']).dt.days
+        df['n_skills'] = df['required_skills'].str.count(',') + 1
+        return df
+
+    def aggregate(df):
+        return df.groupby(['job_title', 'experience_level']).agg(
+            postings=('job_id', 'count'),
+            median_salary=('salary_usd', 'median'),
+            mean_benefits=('benefits_score', 'mean'),
+            days_open=('days_open', 'mean'),
+        ).reset_index()
+
+    def render(summary):
+        return summary.to_html(index=False)
+
+    return [('ingest', ingest), ('transform', transform), ('aggregate', aggregate), ('render', render)]
+
+
+PIPELINES = {
+    'nba': (nba_pipeline, lambda size: synthetic_data.nba_result_set(synthetic_data.nba_league_log(size))),
+    'bitcoin': (bitcoin_pipeline, lambda size: synthetic_data.coingecko_market_chart(size)),
+    'ai_jobs': (ai_jobs_pipeline, lambda size: synthetic_data.ai_jobs_csv(size)),
+    'matrix': (matrix_pipeline, lambda size: synthetic_data.multi_asset_prices(size)),
+}
+
+
+# MEASUREMENT
+
+def _rows(value):
+    if isinstance(value, (pd.DataFrame, pd.Series, list, dict)):
+        return len(value)
+    return None
+
+
+def measure(func, value, repeats=3):
+    """
+    Best-of-N wall time (without tracing overhead), then one traced run for
+    peak Python memory. Inputs are copied so in-place stages stay repeatable.
+    """
+    def fresh():
+        return value.copy() if isinstance(value, pd.DataFrame) else value
+
+    timings = []
+    for _ in range(repeats):
+        data = fresh()
+        start = time.perf_counter()
+        func(data)
+        timings.append(time.perf_counter() - start)
+
+    data = fresh()
+    tracemalloc.start()
+    result = func(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, min(timings), peak
+
+
+def run_pipeline(name, size_label, repeats=3):
+    """Run one pipeline at one named size; returns a list of stage records"""
+    build_pipeline, generate = PIPELINES[name]
+    size = synthetic_data.SIZES[name][size_label]
+    value = generate(size)
+
+    records = []
+    for stage, func in build_pipeline():
+        try:
+            value, seconds, peak = measure(func, value, repeats)
+        except ImportError as e:
+            print(f"  {name:<8} {size_label:<7} {stage:<10} skipped ({e})")
+            break
+        records.append({
+            'pipeline': name, 'size': size_label, 'n': size, 'stage': stage,
+            'seconds': seconds, 'peak_bytes': peak, 'rows_out': _rows(value),
+        })
+        print(f"  {name:<8} {size_label:<7} {stage:<10} {seconds * 1000:10.1f} ms  peak {peak / 2**20:8.1f} MB")
+    return records
+
+
+def environment():
+    """Metadata saved with each run so results stay comparable"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+    }
+
+
+def save_results(records, results_dir=RESULTS_DIR):
+    os.makedirs(results_dir, exist_ok=True)
+    path = os.path.join(results_dir, datetime.now().strftime('%Y%m%d-%H%M%S') + '.json')
+    with open(path, 'w') as f:
+        json.dump({'environment': environment(), 'results': records}, f, indent=2)
+    return path
+
+
+def compare(current_path, results_dir=RESULTS_DIR):
+    """Print per-stage timing ratios against the previous saved run"""
+    runs = sorted(glob.glob(os.path.join(results_dir, '*.json')))
+    runs = [path for path in runs if os.path.abspath(path) != os.path.abspath(current_path)]
+    if not runs:
+        print("No previous run to compare against")
+        return
+
+    with open(runs[-1]) as f:
+        previous = {(r['pipeline'], r['size'], r['stage']): r for r in json.load(f)['results']}
+    with open(current_path) as f:
+        current = json.load(f)['results']
+
+    print(f"\nComparison with {os.path.basename(runs[-1])} (ratio > 1 means slower):")
+    for record in current:
+        key = (record['pipeline'], record['size'], record['stage'])
+        if key in previous and previous[key]['seconds'] > 0:
+            ratio = record['seconds'] / previous[key]['seconds']
+            flag = '  <-- regression' if ratio > 1.2 else ''
+            print(f"  {' / '.join(key):<34} {ratio:6.2f}x{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark suite for the project pipelines")
+    parser.add_argument('--pipelines', nargs='+', default=list(PIPELINES), choices=list(PIPELINES))
+    parser.add_argument('--sizes', nargs='+', default=['small', 'medium'], choices=['small', 'medium', 'large'])
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--compare', action='store_true', help="compare with the previous saved run")
+    args = parser.parse_args()
+
+    print("Cross-Project Benchmark Suite")
+    print("=" * 40)
+
+    records = []
+    for name in args.pipelines:
+        for size_label in args.sizes:
+            records.extend(run_pipeline(name, size_label, args.repeats))
+
+    path = save_results(records)
+    print(f"\nResults saved to {path}")
+
+    if args.compare:
+        compare(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Deterministic Synthetic Data Generators
+Offline stand-ins for the NBA TeamGameLog endpoint, CoinGecko market charts
+and WEBDATA/content/ai_job_dataset.csv, at several sizes
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+# Named sizes used by the benchmark suite
+SIZES = {
+    'nba': {'small': 1, 'medium': 3, 'large': 10},                    # seasons
+    'bitcoin': {'small': 720, 'medium': 100_000, 'large': 1_000_000},  # price points
+    'ai_jobs': {'small': 15_000, 'medium': 100_000, 'large': 500_000}, # rows
+    'matrix': {'small': 2_000, 'medium': 20_000, 'large': 100_000},   # timestamps x 50 assets
+}
+
+NBA_TEAMS = [
+    ('ATL', 'Atlanta Hawks'), ('BOS', 'Boston Celtics'), ('BKN', 'Brooklyn Nets'),
+    ('CHA', 'Charlotte Hornets'), ('CHI', 'Chicago Bulls'), ('CLE', 'Cleveland Cavaliers'),
+    ('DAL', 'Dallas Mavericks'), ('DEN', 'Denver Nuggets'), ('DET', 'Detroit Pistons'),
+    ('GSW', 'Golden State Warriors'), ('HOU', 'Houston Rockets'), ('IND', 'Indiana Pacers'),
+    ('LAC', 'LA Clippers'), ('LAL', 'Los Angeles Lakers'), ('MEM', 'Memphis Grizzlies'),
+    ('MIA', 'Miami Heat'), ('MIL', 'Milwaukee Bucks'), ('MIN', 'Minnesota Timberwolves'),
+    ('NOP', 'New Orleans Pelicans'), ('NYK', 'New York Knicks'), ('OKC', 'Oklahoma City Thunder'),
+    ('ORL', 'Orlando Magic'), ('PHI', 'Philadelphia 76ers'), ('PHX', 'Phoenix Suns'),
+    ('POR', 'Portland Trail Blazers'), ('SAC', 'Sacramento Kings'), ('SAS', 'San Antonio Spurs'),
+    ('TOR', 'Toronto Raptors'), ('UTA', 'Utah Jazz'), ('WAS', 'Washington Wizards'),
+]
+NBA_TEAM_IDS = {abbr: 1610612737 + i for i, (abbr, _) in enumerate(NBA_TEAMS)}
+
+# Column order returned by nba_api's TeamGameLog
+TEAM_GAME_LOG_HEADERS = [
+    'Team_ID', 'Game_ID', 'GAME_DATE', 'MATCHUP', 'WL', 'W', 'L', 'W_PCT', 'MIN',
+    'FGM', 'FGA', 'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT', 'FTM', 'FTA', 'FT_PCT',
+    'OREB', 'DREB', 'REB', 'AST', 'STL', 'BLK', 'TOV', 'PF', 'PTS',
+]
+
+AI_JOB_COLUMNS = [
+    'job_id', 'job_title', 'salary_usd', 'salary_currency', 'experience_level',
+    'employment_type', 'company_location', 'company_size', 'employee_residence',
+    'remote_ratio', 'required_skills', 'education_required', 'years_experience',
+    'industry', 'posting_date', 'application_deadline', 'job_description_length',
+    'benefits_score', 'company_name',
+]
+_JOB_TITLES = ['AI Research Scientist', 'AI Software Engineer', 'Machine Learning Engineer',
+               'Data Scientist', 'NLP Engineer', 'Computer Vision Engineer', 'Data Engineer',
+               'ML Ops Engineer', 'AI Product Manager', 'Deep Learning Engineer']
+_COUNTRIES = ['China', 'Canada', 'Ireland', 'United States', 'Germany', 'France', 'India',
+              'United Kingdom', 'Japan', 'Singapore', 'Australia', 'Israel']
+_SKILLS = ['Python', 'SQL', 'PyTorch', 'TensorFlow', 'Kubernetes', 'Docker', 'AWS', 'Azure',
+           'NLP', 'Deep Learning', 'Mathematics', 'Linux', 'Tableau', 'Spark', 'Scala']
+_INDUSTRIES = ['Automotive', 'Media', 'Finance', 'Healthcare', 'Retail', 'Technology',
+               'Education', 'Energy', 'Manufacturing', 'Telecommunications']
+_COMPANIES = ['Smart Analytics', 'TechCorp Inc', 'Autonomous Tech', 'Future Systems',
+              'Neural Networks Co', 'Cloud AI Solutions', 'DataVision Ltd', 'Quantum Labs']
+
+
+def nba_league_log(n_seasons=1, games_per_team=82, first_season=2024, seed=0):
+    """
+    League-wide game log in TeamGameLog shape: every game appears twice,
+    once from each team's point of view, sharing the same Game_ID.
+    """
+    rng = np.random.default_rng(seed)
+    n_teams = len(NBA_TEAMS)
+    abbrs = np.array([abbr for abbr, _ in NBA_TEAMS])
+    team_ids = np.array([NBA_TEAM_IDS[abbr] for abbr in abbrs])
+    frames = []
+
+    for season in range(first_season, first_season + n_seasons):
+        n_games = n_teams * games_per_team // 2
+        home = rng.integers(0, n_teams, n_games)
+        away = (home + rng.integers(1, n_teams, n_games)) % n_teams
+        day = np.sort(rng.integers(0, 170, n_games))
+        dates = np.datetime64(f'{season}-10-22') + day.astype('timedelta64[D]')
+
+        home_pts = rng.normal(114, 12, n_games).round().astype(int)
+        away_pts = rng.normal(112, 12, n_games).round().astype(int)
+        home_pts[home_pts == away_pts] += 1
+        game_ids = np.array([f"002{season % 100:02d}{i + 1:05d}" for i in range(n_games)])
+
+        # Two rows per game: home perspective then away perspective
+        side_home = pd.DataFrame({
+            'team': home, 'opp': away, 'pts': home_pts, 'opp_pts': away_pts,
+            'sep': ' vs. ', 'Game_ID': game_ids, 'date': dates,
+        })
+        side_away = pd.DataFrame({
+            'team': away, 'opp': home, 'pts': away_pts, 'opp_pts': home_pts,
+            'sep': ' @ ', 'Game_ID': game_ids, 'date': dates,
+        })
+        games = pd.concat([side_home, side_away], ignore_index=True)
+        games = games.sort_values(['team', 'date', 'Game_ID'], kind='stable').reset_index(drop=True)
+
+        win = games['pts'] > games['opp_pts']
+        by_team = win.groupby(games['team'])
+        wins = by_team.cumsum()
+        losses = (~win).groupby(games['team']).cumsum()
+        n = len(games)
+
+        fga = rng.integers(78, 98, n)
+        fgm = (fga * rng.uniform(0.40, 0.52, n)).astype(int)
+        fg3a = rng.integers(25, 45, n)
+        fg3m = np.minimum((fg3a * rng.uniform(0.30, 0.42, n)).astype(int), fgm)
+        fta = rng.integers(12, 30, n)
+        oreb = rng.integers(6, 15, n)
+        dreb = rng.integers(28, 40, n)
+
+        frame = pd.DataFrame({
+            'Team_ID': team_ids[games['team']],
+            'Game_ID': games['Game_ID'],
+            'GAME_DATE': pd.to_datetime(games['date']).dt.strftime('%b %d, %Y').str.upper(),
+            'MATCHUP': abbrs[games['team']] + games['sep'] + abbrs[games['opp']],
+            'WL': np.where(win, 'W', 'L'),
+            'W': wins.to_numpy(),
+            'L': losses.to_numpy(),
+            'W_PCT': (wins / (wins + losses)).round(3).to_numpy(),
+            'MIN': 240,
+            'FGM': fgm, 'FGA': fga, 'FG_PCT': (fgm / fga).round(3),
+            'FG3M': fg3m, 'FG3A': fg3a, 'FG3_PCT': (fg3m / fg3a).round(3),
+            'FTM': (fta * 0.78).astype(int), 'FTA': fta, 'FT_PCT': 0.78,
+            'OREB': oreb, 'DREB': dreb, 'REB': oreb + dreb,
+            'AST': rng.integers(18, 32, n), 'STL': rng.integers(4, 12, n),
+            'BLK': rng.integers(2, 9, n), 'TOV': rng.integers(9, 18, n),
+            'PF': rng.integers(14, 24, n),
+            'PTS': games['pts'].to_numpy(),
+        })
+        frames.append(frame)
+
+    return pd.concat(frames, ignore_index=True)[TEAM_GAME_LOG_HEADERS]
+
+
+def nba_result_set(league_log):
+    """Wrap a game log the way the stats API returns it (headers + rowSet)"""
+    return {
+        'name': 'TeamGameLog',
+        'headers': list(league_log.columns),
+        'rowSet': league_log.to_numpy().tolist(),
+    }
+
+
+def coingecko_market_chart(n_points=720, start=datetime(2025, 1, 1), interval=timedelta(hours=1),
+                           start_price=95_000.0, seed=0):
+    """
+    Dict shaped like CoinGeckoAPI.get_coin_market_chart_by_id():
+    'prices', 'market_caps' and 'total_volumes' as [ms_timestamp, value] pairs.
+    """
+    rng = np.random.default_rng(seed)
+    start_ms = int(start.timestamp() * 1000)
+    step_ms = int(interval.total_seconds() * 1000)
+    timestamps = start_ms + step_ms * np.arange(n_points, dtype=np.int64)
+
+    log_returns = rng.normal(0, 0.004, n_points)
+    prices = start_price * np.exp(np.cumsum(log_returns))
+    market_caps = prices * 19_800_000
+    volumes = rng.lognormal(np.log(3e10), 0.3, n_points)
+
+    def pairs(values):
+        return [[int(t), float(v)] for t, v in zip(timestamps, values)]
+
+    return {'prices': pairs(prices), 'market_caps': pairs(market_caps), 'total_volumes': pairs(volumes)}
+
+
+def multi_asset_prices(n_timestamps=2_000, n_assets=50, n_factors=3, seed=0):
+    """
+    (timestamps x assets) price table for matrix_engine: correlated log returns
+    from a few common factors plus asset-specific noise
+    """
+    rng = np.random.default_rng(seed)
+    loadings = rng.normal(0, 1, (n_factors, n_assets))
+    factors = rng.normal(0, 0.003, (n_timestamps, n_factors))
+    log_returns = factors @ loadings + rng.normal(0, 0.004, (n_timestamps, n_assets))
+    start_prices = rng.uniform(1, 1_000, n_assets)
+    return start_prices * np.exp(np.cumsum(log_returns, axis=0))
+
+
+def ai_jobs_frame(n_rows=15_000, seed=0):
+    """Rows with the same columns and value ranges as ai_job_dataset.csv"""
+    rng = np.random.default_rng(seed)
+
+    def pick(values):
+        return np.asarray(values, dtype=object)[rng.integers(0, len(values), n_rows)]
+
+    posting = np.datetime64('2024-01-01') + rng.integers(0, 486, n_rows).astype('timedelta64[D]')
+    deadline = posting + rng.integers(14, 60, n_rows).astype('timedelta64[D]')
+    skill_idx = np.argsort(rng.random((n_rows, len(_SKILLS))), axis=1)[:, :5]
+    skills = np.asarray(_SKILLS, dtype=object)[skill_idx]
+    experience = pick(['EN', 'MI', 'SE', 'EX'])
+
+    return pd.DataFrame({
+        'job_id': [f"AI{i + 1:05d}" for i in range(n_rows)],
+        'job_title': pick(_JOB_TITLES),
+        'salary_usd': rng.integers(32_000, 400_000, n_rows),
+        'salary_currency': pick(['USD', 'EUR', 'GBP']),
+        'experience_level': experience,
+        'employment_type': pick(['FT', 'PT', 'CT', 'FL']),
+        'company_location': pick(_COUNTRIES),
+        'company_size': pick(['S', 'M', 'L']),
+        'employee_residence': pick(_COUNTRIES),
+        'remote_ratio': pick([0, 50, 100]),
+        'required_skills': [', '.join(row) for row in skills],
+        'education_required': pick(['Associate', 'Bachelor', 'Master', 'PhD']),
+        'years_experience': rng.integers(0, 20, n_rows),
+        'industry': pick(_INDUSTRIES),
+        'posting_date': posting.astype(str),
+        'application_deadline': deadline.astype(str),
+        'job_description_length': rng.integers(500, 2500, n_rows),
+        'benefits_score': rng.integers(50, 101, n_rows) / 10,
+        'company_name': pick(_COMPANIES),
+    })[AI_JOB_COLUMNS]
+
+
+def ai_jobs_csv(n_rows=15_000, seed=0):
+    """ai_jobs_frame() serialised as CSV text"""
+    return ai_jobs_frame(n_rows, seed).to_csv(index=False)
@@ -1,59 +1,47 @@
+"""
+Bitcoin Analysis Dashboard
+Fetches 30 days of Bitcoin prices from CoinGecko and writes candlestick,
+price-trend and combined dashboard HTML pages. The parse, aggregate and
+figure steps are plain functions so the benchmark suite times this code.
+"""
+
+import os
+import sys
+
 import pandas as pd
+import plotly
 import plotly.graph_objects as go
 import plotly.offline as pyo
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'PIPELINE'))
+from pipeline_trace import Tracer, Profiler
+from build_manifest import BuildManifest, fingerprint
+from http_transport import install as install_http_transport, bytes_received
+
 try:
     from pycoingecko import CoinGeckoAPI
-    print("CoinGecko API imported successfully")
 except ImportError:
+    # The parse / figure helpers still work offline (e.g. from the benchmark suite)
     print("PyCoingecko not installed. Run: pip install pycoingecko")
-    exit()
+    CoinGeckoAPI = None
 
-try:
-    # Initialize CoinGecko API
-    cg = CoinGeckoAPI()
-    print("CoinGecko API initialized")
-
-    # Get Bitcoin market chart data for past 30 days
-    print("Fetching Bitcoin price data for past 30 days...")
-    bitcoin_data = cg.get_coin_market_chart_by_id(
-        id='bitcoin',
-        vs_currency='usd',
-        days=30
-    )
+# Stage timings for this run; pass --profile to also dump cProfile / tracemalloc hot spots
+tracer = Tracer('bitcoin')
 
-    print(f"Successfully fetched Bitcoin data")
-    print(f"Data keys: {list(bitcoin_data.keys())}")
-    print(f"Price data points: {len(bitcoin_data['prices'])}")
 
-except Exception as e:
-    print(f"Error fetching data: {e}")
-    exit()
+def prices_frame(bitcoin_data):
+    """DataFrame of [ms timestamp, price] pairs from a CoinGecko market chart"""
+    return pd.DataFrame(bitcoin_data['prices'], columns=['TimeStamp', 'Price'])
 
-try:
-    # Convert price data to DataFrame
-    data = pd.DataFrame(bitcoin_data['prices'], columns=['TimeStamp', 'Price'])
-    print(f"Created DataFrame with shape: {data.shape}")
 
-    # Convert timestamp to datetime
+def add_dates(data):
+    """Add a datetime Date column from the millisecond timestamps"""
     data['Date'] = pd.to_datetime(data['TimeStamp'], unit='ms')
-    print("Converted timestamps to datetime")
-
-    # Display basic info
-    print(f"\nData Info:")
-    print(f"   Date range: {data['Date'].min()} to {data['Date'].max()}")
-    print(f"   Price range: ${data['Price'].min():.2f} to ${data['Price'].max():.2f}")
-    print(f"   Average price: ${data['Price'].mean():.2f}")
+    return data
 
-    # Show sample data
-    print(f"\nSample data:")
-    print(data[['Date', 'Price']].head())
-except Exception as e:
-    print(f"Error processing data: {e}")
-    exit()
 
-try:
-    # Group by date to create OHLC (Open, High, Low, Close) data
+def ohlc(data):
+    """Group by date to create OHLC (Open, High, Low, Close) data"""
     candlestick_data = data.groupby(data.Date.dt.date).agg({
         'Price': ['min', 'max', 'first', 'last']
     })
@@ -61,16 +49,11 @@ try:
     # Flatten column names
     candlestick_data.columns = ['min', 'max', 'first', 'last']
     candlestick_data.reset_index(inplace=True)
+    return candlestick_data
 
-    print(f"Candlestick data shape: {candlestick_data.shape}")
-    print(f"Sample candlestick data:")
-    print(candlestick_data.head())
-except Exception as e:
-    print(f"Error creating candlestick data: {e}")
-    exit()
 
-try:
-    # Create candlestick chart using Plotly
+def candlestick_figure(candlestick_data):
+    """Candlestick chart of the daily OHLC data"""
     fig_candlestick = go.Figure(data=[go.Candlestick(
         x=candlestick_data.index,
         open=candlestick_data['first'],
@@ -87,18 +70,11 @@ try:
         title='Bitcoin Candlestick Chart Over Past 30 Days',
         template='plotly_white'
     )
+    return fig_candlestick
 
-    print("Candlestick chart created successfully")
-
-    # Save candlestick chart as HTML file
-    pyo.plot(fig_candlestick, filename='bitcoin_candlestick_chart.html', auto_open=False)
-    print("Chart saved as 'bitcoin_candlestick_chart.html'")
 
-except Exception as e:
-    print(f"Error creating candlestick chart: {e}")
-
-try:
-    # Create simple line chart
+def price_trend_figure(data):
+    """Line chart of every price point"""
     fig_line = go.Figure()
 
     fig_line.add_trace(go.Scatter(
@@ -116,89 +92,210 @@ try:
         template='plotly_white',
         hovermode='x unified'
     )
+    return fig_line
 
-    # Save line chart
-    pyo.plot(fig_line, filename='bitcoin_price_trend.html', auto_open=False)
-    print("Price trend chart saved as 'bitcoin_price_trend.html'")
 
-except Exception as e:
-    print(f"Error creating line chart: {e}")
+def main():
+    if CoinGeckoAPI is None:
+        return
 
-try:
-    # Price statistics
-    price_change = data['Price'].iloc[-1] - data['Price'].iloc[0]
-    price_change_pct = (price_change / data['Price'].iloc[0]) * 100
-    volatility = data['Price'].std()
-
-    print(f"Price Analysis:")
-    print(f"   Starting price: ${data['Price'].iloc[0]:.2f}")
-    print(f"   Ending price: ${data['Price'].iloc[-1]:.2f}")
-    print(f"   Price change: ${price_change:.2f} ({price_change_pct:.2f}%)")
-    print(f"   Volatility (std): ${volatility:.2f}")
-
-    # Daily price changes
-    data['Daily_Change'] = data['Price'].pct_change() * 100
-    daily_changes = data['Daily_Change'].dropna()
-
-    print(f"\nDaily Change Analysis:")
-    print(f"   Average daily change: {daily_changes.mean():.2f}%")
-    print(f"   Max daily gain: {daily_changes.max():.2f}%")
-    print(f"   Max daily loss: {daily_changes.min():.2f}%")
-except Exception as e:
-    print(f"Error in analysis: {e}")
-
-# Create combined HTML page
-try:
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Bitcoin Analysis Dashboard</title>
-        <style>
-            body {{ font-family: Arial, sans-serif; margin: 20px; }}
-            .chart-container {{ margin: 20px 0; }}
-            .stats {{ background: #f5f5f5; padding: 15px; border-radius: 5px; margin: 20px 0; }}
-        </style>
-    </head>
-    <body>
-        <h1>Bitcoin Analysis Dashboard - Past 30 Days</h1>
-        
-        <div class="stats">
-            <h3>Price Statistics</h3>
-            <p><strong>Date Range:</strong> {data['Date'].min().strftime('%Y-%m-%d')} to {data['Date'].max().strftime('%Y-%m-%d')}</p>
-            <p><strong>Starting Price:</strong> ${data['Price'].iloc[0]:.2f}</p>
-            <p><strong>Ending Price:</strong> ${data['Price'].iloc[-1]:.2f}</p>
-            <p><strong>Price Change:</strong> ${price_change:.2f} ({price_change_pct:.2f}%)</p>
-            <p><strong>Volatility (std):</strong> ${volatility:.2f}</p>
-        </div>
-        
-        <div class="chart-container">
-            <h2>Candlestick Chart</h2>
-            <iframe src="bitcoin_candlestick_chart.html" width="100%" height="600" frameborder="0"></iframe>
-        </div>
-        
-        <div class="chart-container">
-            <h2>Price Trend</h2>
-            <iframe src="bitcoin_price_trend.html" width="100%" height="600" frameborder="0"></iframe>
-        </div>
-    </body>
-    </html>
-    """
-    
-    with open('bitcoin_combined_dashboard.html', 'w') as f:
-        f.write(html_content)
-    
-    print("Combined dashboard saved as 'bitcoin_combined_dashboard.html'")
-    
-    # Open the combined dashboard in default browser
-    import webbrowser
-    import os
-    
-    dashboard_path = os.path.abspath('bitcoin_combined_dashboard.html')
-    webbrowser.open(f'file://{dashboard_path}')
-    print("Opening dashboard in browser...")
-    
-except Exception as e:
-    print(f"Error creating combined dashboard: {e}")
-
-print("\nScript completed. Dashboard should open in your browser automatically.")
\ No newline at end of file
+    # HTTP_MODE=record|replay captures or replays CoinGecko responses (default: live)
+    install_http_transport()
+    profiler = Profiler().start() if '--profile' in sys.argv else None
+    # Outputs are only rewritten when their figure (data, layout and styling) changes
+    manifest = BuildManifest()
+
+    try:
+        # Initialize CoinGecko API
+        cg = CoinGeckoAPI()
+        print("CoinGecko API initialized")
+
+        # Get Bitcoin market chart data for past 30 days
+        print("Fetching Bitcoin price data for past 30 days...")
+        with tracer.span('fetch') as span:
+            received = bytes_received()
+            bitcoin_data = cg.get_coin_market_chart_by_id(
+                id='bitcoin',
+                vs_currency='usd',
+                days=30
+            )
+            span.add(bytes=bytes_received() - received)
+
+        print(f"Successfully fetched Bitcoin data")
+        print(f"Data keys: {list(bitcoin_data.keys())}")
+        print(f"Price data points: {len(bitcoin_data['prices'])}")
+
+    except Exception as e:
+        print(f"Error fetching data: {e}")
+        return
+
+    try:
+        with tracer.span('parse') as span:
+            # Convert price data to DataFrame
+            data = prices_frame(bitcoin_data)
+            print(f"Created DataFrame with shape: {data.shape}")
+
+            # Convert timestamp to datetime
+            data = add_dates(data)
+            print("Converted timestamps to datetime")
+            span.add(rows=len(data))
+
+        # Display basic info
+        print(f"\nData Info:")
+        print(f"   Date range: {data['Date'].min()} to {data['Date'].max()}")
+        print(f"   Price range: ${data['Price'].min():.2f} to ${data['Price'].max():.2f}")
+        print(f"   Average price: ${data['Price'].mean():.2f}")
+
+        # Show sample data
+        print(f"\nSample data:")
+        print(data[['Date', 'Price']].head())
+    except Exception as e:
+        print(f"Error processing data: {e}")
+        return
+
+    try:
+        # Group by date to create OHLC (Open, High, Low, Close) data
+        with tracer.span('aggregate') as span:
+            candlestick_data = ohlc(data)
+            span.add(rows=len(data))
+
+        print(f"Candlestick data shape: {candlestick_data.shape}")
+        print(f"Sample candlestick data:")
+        print(candlestick_data.head())
+    except Exception as e:
+        print(f"Error creating candlestick data: {e}")
+        return
+
+    try:
+        # Create candlestick chart using Plotly
+        fig_candlestick = candlestick_figure(candlestick_data)
+
+        print("Candlestick chart created successfully")
+
+        # Save candlestick chart as HTML file
+        with tracer.span('render', output='bitcoin_candlestick_chart.html') as span:
+            built = manifest.build(
+                'bitcoin_candlestick_chart.html',
+                fingerprint(fig_candlestick, plotly.__version__),
+                lambda filename: pyo.plot(fig_candlestick, filename=filename, auto_open=False)
+            )
+            span.add(bytes=os.path.getsize('bitcoin_candlestick_chart.html'), rows=len(candlestick_data), cache_hit=not built)
+        if built:
+            print("Chart saved as 'bitcoin_candlestick_chart.html'")
+
+    except Exception as e:
+        print(f"Error creating candlestick chart: {e}")
+
+    try:
+        # Create simple line chart
+        fig_line = price_trend_figure(data)
+
+        # Save line chart
+        with tracer.span('render', output='bitcoin_price_trend.html') as span:
+            built = manifest.build(
+                'bitcoin_price_trend.html',
+                fingerprint(fig_line, plotly.__version__),
+                lambda filename: pyo.plot(fig_line, filename=filename, auto_open=False)
+            )
+            span.add(bytes=os.path.getsize('bitcoin_price_trend.html'), rows=len(data), cache_hit=not built)
+        if built:
+            print("Price trend chart saved as 'bitcoin_price_trend.html'")
+
+    except Exception as e:
+        print(f"Error creating line chart: {e}")
+
+    try:
+        # Price statistics
+        price_change = data['Price'].iloc[-1] - data['Price'].iloc[0]
+        price_change_pct = (price_change / data['Price'].iloc[0]) * 100
+        volatility = data['Price'].std()
+
+        print(f"Price Analysis:")
+        print(f"   Starting price: ${data['Price'].iloc[0]:.2f}")
+        print(f"   Ending price: ${data['Price'].iloc[-1]:.2f}")
+        print(f"   Price change: ${price_change:.2f} ({price_change_pct:.2f}%)")
+        print(f"   Volatility (std): ${volatility:.2f}")
+
+        # Daily price changes
+        data['Daily_Change'] = data['Price'].pct_change() * 100
+        daily_changes = data['Daily_Change'].dropna()
+
+        print(f"\nDaily Change Analysis:")
+        print(f"   Average daily change: {daily_changes.mean():.2f}%")
+        print(f"   Max daily gain: {daily_changes.max():.2f}%")
+        print(f"   Max daily loss: {daily_changes.min():.2f}%")
+    except Exception as e:
+        print(f"Error in analysis: {e}")
+
+    # Create combined HTML page
+    try:
+        html_content = f"""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <title>Bitcoin Analysis Dashboard</title>
+            <style>
+                body {{ font-family: Arial, sans-serif; margin: 20px; }}
+                .chart-container {{ margin: 20px 0; }}
+                .stats {{ background: #f5f5f5; padding: 15px; border-radius: 5px; margin: 20px 0; }}
+            </style>
+        </head>
+        <body>
+            <h1>Bitcoin Analysis Dashboard - Past 30 Days</h1>
+
+            <div class="stats">
+                <h3>Price Statistics</h3>
+                <p><strong>Date Range:</strong> {data['Date'].min().strftime('%Y-%m-%d')} to {data['Date'].max().strftime('%Y-%m-%d')}</p>
+                <p><strong>Starting Price:</strong> ${data['Price'].iloc[0]:.2f}</p>
+                <p><strong>Ending Price:</strong> ${data['Price'].iloc[-1]:.2f}</p>
+                <p><strong>Price Change:</strong> ${price_change:.2f} ({price_change_pct:.2f}%)</p>
+                <p><strong>Volatility (std):</strong> ${volatility:.2f}</p>
+            </div>
+
+            <div class="chart-container">
+                <h2>Candlestick Chart</h2>
+                <iframe src="bitcoin_candlestick_chart.html" width="100%" height="600" frameborder="0"></iframe>
+            </div>
+
+            <div class="chart-container">
+                <h2>Price Trend</h2>
+                <iframe src="bitcoin_price_trend.html" width="100%" height="600" frameborder="0"></iframe>
+            </div>
+        </body>
+        </html>
+        """
+
+        def write_dashboard(filename):
+            with open(filename, 'w') as f:
+                f.write(html_content)
+
+        with tracer.span('render', output='bitcoin_combined_dashboard.html') as span:
+            built = manifest.build('bitcoin_combined_dashboard.html', fingerprint(html_content), write_dashboard)
+            span.add(bytes=len(html_content), cache_hit=not built)
+
+        if built:
+            print("Combined dashboard saved as 'bitcoin_combined_dashboard.html'")
+
+        # Open the combined dashboard in default browser
+        import webbrowser
+
+        dashboard_path = os.path.abspath('bitcoin_combined_dashboard.html')
+        webbrowser.open(f'file://{dashboard_path}')
+        print("Opening dashboard in browser...")
+
+    except Exception as e:
+        print(f"Error creating combined dashboard: {e}")
+
+    if profiler is not None:
+        profiler.stop()
+
+    tracer.print_summary()
+    tracer.write_json('bitcoin_run_metrics.json')
+    tracer.write_prometheus('bitcoin_run_metrics.prom')
+    print("Run metrics saved as 'bitcoin_run_metrics.json'")
+
+    print("\nScript completed. Dashboard should open in your browser automatically.")
+
+
+if __name__ == "__main__":
+    main()
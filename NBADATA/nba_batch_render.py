@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+NBA Batch Chart Renderer
+Renders static home-vs-away PNG/SVG charts for every team and season in
+parallel with the headless Agg backend, and writes a manifest of outputs
+
+Usage:
+    python nba_batch_render.py --seasons 2023-24 2024-25      # fetch live data
+    python nba_batch_render.py --input teams_data.json        # {season: {team: games}}
+    python nba_batch_render.py --synthetic 10                 # offline, 10 synthetic seasons
+"""
+
+import argparse
+import inspect
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import matplotlib
+matplotlib.use('Agg')  # headless: must be set before pyplot is imported
+import matplotlib.dates as mdates
+import matplotlib.pyplot as plt
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'PIPELINE'))
+from build_manifest import fingerprint
+
+OUTPUT_DIR = "team_charts"
+FORMATS = ['png']
+DPI = 100
+
+# One figure per worker process, created by the pool initializer and reused for every task
+_figure = None
+
+
+def _init_worker(reuse_figure):
+    global _figure
+    if reuse_figure:
+        _figure = plt.figure(figsize=(10, 5))
+
+
+def _plot_team(fig, season, team, games):
+    """Draw one team's home/away points chart on a (cleared) figure"""
+    ax = fig.add_subplot(1, 1, 1)
+    ordered = sorted(games, key=lambda g: g['GAME_DATE'])
+
+    summary = {}
+    for side, color, marker, win_color, loss_color in [
+        ('Home', 'blue', 'o', 'green', 'red'),
+        ('Away', 'orange', '^', 'lightgreen', 'pink'),
+    ]:
+        side_games = [g for g in ordered if g['HOME_AWAY'] == side]
+        if not side_games:
+            summary[side] = {'games': 0, 'wins': 0, 'avg_pts': None}
+            continue
+
+        dates = [datetime.strptime(g['GAME_DATE'], '%Y-%m-%d') for g in side_games]
+        points = [g['PTS'] for g in side_games]
+        wins = sum(g['WL'] == 'W' for g in side_games)
+        avg = sum(points) / len(points)
+
+        ax.plot(dates, points, color=color, linewidth=1.5, label=f"{side} Games ({len(side_games)})")
+        ax.scatter(dates, points, marker=marker, s=30, zorder=3, edgecolors='white',
+                   c=[win_color if g['WL'] == 'W' else loss_color for g in side_games])
+        ax.axhline(avg, color=color, linestyle='--', linewidth=1)
+        summary[side] = {'games': len(side_games), 'wins': wins, 'avg_pts': round(avg, 1)}
+
+    ax.set_title(f"{team} - {season} Home vs Away Points")
+    ax.set_xlabel('Game Date')
+    ax.set_ylabel('Points Scored')
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%b %Y'))
+    ax.grid(alpha=0.3)
+    ax.legend(loc='upper left')
+    return summary
+
+
+def render_team(task):
+    """Worker task: render one (season, team) chart in every requested format"""
+    season, team, games, output_dir, formats = task
+
+    if _figure is not None:
+        fig = _figure
+        fig.clf()
+    else:
+        fig = plt.figure(figsize=(10, 5))
+
+    try:
+        summary = _plot_team(fig, season, team, games)
+
+        slug = team.lower().replace(' ', '_')
+        files = []
+        for fmt in formats:
+            path = os.path.join(output_dir, season, f"{slug}.{fmt}")
+            fig.savefig(path, format=fmt, dpi=DPI)
+            files.append(os.path.relpath(path, output_dir))
+    finally:
+        if fig is not _figure:
+            plt.close(fig)
+
+    return {'season': season, 'team': team, 'files': files, **summary}
+
+
+def render_all(teams_by_season, output_dir=OUTPUT_DIR, formats=FORMATS, workers=None, reuse_figure=True):
+    """
+    Render every (season, team) chart with a process pool.
+    teams_by_season: {season: {team: [{'GAME_DATE', 'PTS', 'HOME_AWAY', 'WL'}, ...]}}
+    Charts whose games, formats and plotting code (_plot_team's source) hash the
+    same as in the previous manifest (and whose files still exist) are not re-rendered.
+    Returns the manifest, which is also written to <output_dir>/manifest.json.
+    """
+    manifest_path = os.path.join(output_dir, 'manifest.json')
+    try:
+        with open(manifest_path, 'r') as f:
+            previous = {(c['season'], c['team']): c for c in json.load(f)['charts']}
+    except (OSError, ValueError, KeyError):
+        previous = {}
+
+    plot_source = inspect.getsource(_plot_team)
+    tasks, hashes, charts = [], [], []
+    for season, all_teams_data in teams_by_season.items():
+        os.makedirs(os.path.join(output_dir, season), exist_ok=True)
+        for team, games in sorted(all_teams_data.items()):
+            if not games:
+                continue
+            digest = fingerprint(season, team, games, formats, DPI, plot_source)
+            cached = previous.get((season, team))
+            if (cached is not None and cached.get('hash') == digest
+                    and all(os.path.exists(os.path.join(output_dir, path)) for path in cached['files'])):
+                charts.append(cached)
+                continue
+            tasks.append((season, team, games, output_dir, formats))
+            hashes.append(digest)
+
+    workers = workers or os.cpu_count()
+    chunksize = max(1, len(tasks) // (workers * 4))
+
+    start = time.perf_counter()
+    if tasks:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(reuse_figure,)) as pool:
+            for chart, digest in zip(pool.map(render_team, tasks, chunksize=chunksize), hashes):
+                charts.append({**chart, 'hash': digest})
+    elapsed = time.perf_counter() - start
+    charts.sort(key=lambda c: (c['season'], c['team']))
+
+    manifest = {
+        'generated': datetime.now().isoformat(timespec='seconds'),
+        'formats': formats,
+        'workers': workers,
+        'seconds': round(elapsed, 3),
+        'charts': charts,
+    }
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    print(f"Rendered {len(tasks)} charts ({len(tasks) * len(formats)} files) "
+          f"in {elapsed:.2f}s with {workers} workers; {len(charts) - len(tasks)} unchanged")
+    return manifest
+
+
+def load_teams_data(path):
+    """Read {season: {team: games}} (or a single-season {team: games}) from JSON"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if data and all(isinstance(value, list) for value in data.values()):
+        data = {'season': data}
+    return data
+
+
+def fetch_teams_data(seasons):
+    """Fetch full-season game logs for every team via nba_team_visualizer"""
+    import nba_team_visualizer as viz
+
+    return {season: viz.get_all_teams_data(season=season, recent_days=None) for season in seasons}
+
+
+def synthetic_teams_data(n_seasons):
+    """Offline data from the benchmark generators, in get_all_teams_data() format"""
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'BENCHMARKS'))
+    import nba_game_log
+    import synthetic_data
+
+    log = nba_game_log.normalize_game_log(synthetic_data.nba_league_log(n_seasons))
+    season_start = log['GAME_ID'] // 100_000 % 100 + 2000
+    seasons = season_start.astype(str) + '-' + ((season_start + 1) % 100).astype(str).str.zfill(2)
+    names = dict(synthetic_data.NBA_TEAMS)
+
+    teams_by_season = {}
+    for season, games in log.groupby(seasons.to_numpy()):
+        teams_by_season[season] = nba_game_log.team_records(games, names=names)
+    return teams_by_season
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render static home/away charts for all NBA teams")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--input', help="JSON file with {season: {team: games}}")
+    source.add_argument('--seasons', nargs='+', help="seasons to fetch live, e.g. 2024-25")
+    source.add_argument('--synthetic', type=int, metavar='N', help="render N synthetic seasons offline")
+    parser.add_argument('--output-dir', default=OUTPUT_DIR)
+    parser.add_argument('--formats', nargs='+', default=FORMATS, choices=['png', 'svg', 'pdf'])
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    print("NBA Batch Chart Renderer")
+    print("=" * 40)
+
+    if args.input:
+        teams_by_season = load_teams_data(args.input)
+    elif args.synthetic:
+        teams_by_season = synthetic_teams_data(args.synthetic)
+    else:
+        teams_by_season = fetch_teams_data(args.seasons or ["2024-25"])
+
+    render_all(teams_by_season, args.output_dir, args.formats, args.workers)
+    print(f"Manifest saved as: {os.path.join(args.output_dir, 'manifest.json')}")
+
+
+if __name__ == "__main__":
+    main()
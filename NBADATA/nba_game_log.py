@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Compact Normalized NBA Game Log
+MATCHUP is parsed once into opponent + home flag, WL becomes a bool, PTS an
+int16 and GAME_DATE a sorted day-resolution index, so date windows are a
+searchsorted slice and per-team records come from a single groupby
+"""
+
+import os
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+
+_MATCHUP = re.compile(r'^\s*(\S+)\s+(vs\.?|@)\s+(\S+)\s*$')
+
+
+def parse_matchups(matchups):
+    """
+    Split MATCHUP strings ('GSW vs. LAC' / 'GSW @ LAC') into team, opponent
+    and home flag. Only the distinct strings are parsed (a league has at most
+    30 x 29 x 2 of them); rows are mapped back through factorize codes.
+
+    Missing or unrecognised values get a missing team/opponent and, like the
+    original 'vs' in str(MATCHUP) check, count as home only if they contain 'vs'.
+    """
+    codes, uniques = pd.factorize(matchups, use_na_sentinel=False)
+    team, opp, home = [], [], []
+    unparsed = []
+    for i, matchup in enumerate(uniques):
+        text = matchup if isinstance(matchup, str) else ''
+        match = _MATCHUP.match(text)
+        if match:
+            left, separator, right = match.groups()
+            team.append(left)
+            opp.append(right)
+            home.append(separator.startswith('vs'))
+        else:
+            unparsed.append(i)
+            team.append(None)
+            opp.append(None)
+            home.append('vs' in text)
+
+    if unparsed:
+        n_rows = int(np.isin(codes, unparsed).sum())
+        examples = [uniques[i] for i in unparsed[:5]]
+        print(f"Warning: {n_rows} row(s) with unparseable MATCHUP values {examples}")
+
+    abbrs = sorted((set(team) | set(opp)) - {None})
+    team_cat = pd.Categorical(team, categories=abbrs)
+    opp_cat = pd.Categorical(opp, categories=abbrs)
+    return (
+        pd.Categorical.from_codes(team_cat.codes[codes], categories=abbrs),
+        pd.Categorical.from_codes(opp_cat.codes[codes], categories=abbrs),
+        np.asarray(home, dtype=bool)[codes],
+    )
+
+
+def _parse_dates(dates):
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        parsed = pd.DatetimeIndex(dates)
+    else:
+        try:
+            # TeamGameLog returns e.g. 'APR 13, 2025'
+            parsed = pd.DatetimeIndex(pd.to_datetime(dates, format='%b %d, %Y'))
+        except ValueError:
+            parsed = pd.DatetimeIndex(pd.to_datetime(dates))
+    # pandas has no datetime64[D] unit; day-normalized seconds is the closest compact equivalent
+    return parsed.normalize().as_unit('s')
+
+
+def normalize_game_log(games_df):
+    """
+    Convert a TeamGameLog-shaped DataFrame (one or many teams) to the compact schema:
+    TEAM_ID/GAME_ID int32, TEAM/OPP category, HOME/WIN bool, PTS int16,
+    indexed by GAME_DATE (sorted ascending)
+    """
+    team, opp, home = parse_matchups(games_df['MATCHUP'].to_numpy())
+
+    log = pd.DataFrame({
+        'TEAM_ID': games_df['Team_ID'].to_numpy(dtype=np.int32),
+        'GAME_ID': pd.to_numeric(games_df['Game_ID']).to_numpy(dtype=np.int32),
+        'TEAM': team,
+        'OPP': opp,
+        'HOME': home,
+        'WIN': (games_df['WL'] == 'W').to_numpy(),
+        'PTS': games_df['PTS'].fillna(0).to_numpy(dtype=np.int16),
+    }, index=_parse_dates(games_df['GAME_DATE']))
+    log.index.name = 'GAME_DATE'
+
+    # Rows whose MATCHUP could not be parsed still belong to a known team
+    missing = log['TEAM'].isna().to_numpy()
+    if missing.any():
+        known = log.loc[~missing, ['TEAM_ID', 'TEAM']].drop_duplicates('TEAM_ID')
+        by_id = dict(zip(known['TEAM_ID'], known['TEAM']))
+        filled = log['TEAM'].to_numpy(dtype=object)
+        filled[missing] = [by_id.get(team_id) for team_id in log['TEAM_ID'].to_numpy()[missing]]
+        log['TEAM'] = pd.Categorical(filled, categories=log['TEAM'].cat.categories)
+
+    return log.sort_index(kind='stable')
+
+
+def combine_logs(logs):
+    """Concatenate per-team normalized logs, unifying TEAM/OPP categories"""
+    abbrs = sorted(set().union(*(log['TEAM'].cat.categories for log in logs),
+                               *(log['OPP'].cat.categories for log in logs)))
+    logs = [
+        log.assign(TEAM=log['TEAM'].cat.set_categories(abbrs), OPP=log['OPP'].cat.set_categories(abbrs))
+        for log in logs
+    ]
+    return pd.concat(logs).sort_index(kind='stable')
+
+
+def date_window(log, start=None, end=None):
+    """Rows with start <= GAME_DATE < end, as a slice found by binary search"""
+    dates = log.index.to_numpy()
+    lo = 0 if start is None else dates.searchsorted(np.datetime64(pd.Timestamp(start), 's'), side='left')
+    hi = len(dates) if end is None else dates.searchsorted(np.datetime64(pd.Timestamp(end), 's'), side='left')
+    return log.iloc[lo:hi]
+
+
+def home_away_records(log):
+    """Home/away wins and losses per team from one groupby"""
+    grouped = log.groupby(['TEAM', 'HOME'], observed=True)['WIN'].agg(['sum', 'count']).unstack('HOME', fill_value=0)
+    records = pd.DataFrame(index=grouped.index)
+    for flag, side in [(True, 'home'), (False, 'away')]:
+        wins = grouped['sum'][flag] if flag in grouped['sum'] else 0
+        games = grouped['count'][flag] if flag in grouped['count'] else 0
+        records[f'{side}_wins'] = wins
+        records[f'{side}_losses'] = games - wins
+    return records.astype(int)
+
+
+def team_records(log, names=None, most_recent_first=True):
+    """
+    Per-team chart records in the get_all_teams_data() format
+    ({team: [{'GAME_DATE', 'PTS', 'HOME_AWAY', 'WL'}, ...]}) from a single groupby.
+    names optionally maps team abbreviations to full names.
+    """
+    game_date = log.index.strftime('%Y-%m-%d').to_numpy()
+    pts = log['PTS'].to_numpy().tolist()
+    home_away = np.where(log['HOME'].to_numpy(), 'Home', 'Away').tolist()
+    wl = np.where(log['WIN'].to_numpy(), 'W', 'L').tolist()
+    game_date = game_date.tolist()
+
+    records = {}
+    for team, positions in log.groupby('TEAM', observed=True).indices.items():
+        if most_recent_first:
+            positions = positions[::-1]
+        key = names.get(team, team) if names else team
+        records[key] = [
+            {'GAME_DATE': game_date[i], 'PTS': pts[i], 'HOME_AWAY': home_away[i], 'WL': wl[i]}
+            for i in positions
+        ]
+    return records
+
+
+def _deep_size(records):
+    """Approximate memory of {team: [dict, ...]} including keys and values"""
+    total = sys.getsizeof(records)
+    for team, games in records.items():
+        total += sys.getsizeof(team) + sys.getsizeof(games)
+        for game in games:
+            total += sys.getsizeof(game)
+            total += sum(sys.getsizeof(value) for value in game.values())
+    return total
+
+
+def memory_report(league_log):
+    """
+    Compare the old representation (full DataFrame + per-team list of dicts) with
+    the new one (normalized log + the same list of dicts, which the visualizer
+    still builds via team_records())
+    """
+    raw = league_log.copy()
+    raw['GAME_DATE'] = pd.to_datetime(raw['GAME_DATE'], format='%b %d, %Y')
+    raw_bytes = raw.memory_usage(deep=True).sum()
+
+    log = normalize_game_log(league_log)
+    dict_bytes = _deep_size(team_records(log))
+    log_bytes = log.memory_usage(deep=True, index=True).sum()
+
+    old_total = raw_bytes + dict_bytes
+    new_total = log_bytes + dict_bytes
+    print(f"Rows: {len(league_log):,}")
+    print(f"  DataFrame (all TeamGameLog columns): {raw_bytes / 2**20:8.2f} MB")
+    print(f"  Normalized log:                      {log_bytes / 2**20:8.2f} MB "
+          f"({raw_bytes / log_bytes:.0f}x smaller)")
+    print(f"  Per-team list of dicts (both):       {dict_bytes / 2**20:8.2f} MB")
+    print(f"  Old total (DataFrame + dicts):       {old_total / 2**20:8.2f} MB")
+    print(f"  New total (normalized log + dicts):  {new_total / 2**20:8.2f} MB "
+          f"({old_total / new_total:.1f}x smaller)")
+    return {'dataframe': int(raw_bytes), 'records': int(dict_bytes), 'normalized': int(log_bytes),
+            'old_total': int(old_total), 'new_total': int(new_total)}
+
+
+def main():
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'BENCHMARKS'))
+    import synthetic_data
+
+    print("Compact Normalized Game Log")
+    print("=" * 40)
+    memory_report(synthetic_data.nba_league_log(n_seasons=10))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+League-Wide Head-to-Head Matrices and Opponent-Adjusted Ratings
+Builds 30x30 win / point-differential / game-count matrices from the
+normalized game log in one vectorized pass (games joined on GAME_ID) and
+solves least-squares team ratings with NumPy
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def pair_games(log):
+    """
+    One row per game: home and away sides joined on GAME_ID.
+    Games where only one side was fetched are dropped.
+    """
+    columns = ['GAME_ID', 'TEAM', 'PTS']
+    home = log.loc[log['HOME'].to_numpy(), columns]
+    away = log.loc[~log['HOME'].to_numpy(), columns]
+    games = home.merge(away, on='GAME_ID', suffixes=('_HOME', '_AWAY'))
+    return games.drop_duplicates('GAME_ID')
+
+
+def head_to_head(log):
+    """
+    Head-to-head matrices indexed [team, opponent]:
+    wins, games, point_diff (total margin) and avg_diff (margin per game).
+    The axis holds only teams that appear in a paired game, so a partial fetch
+    does not produce empty rows for opponents whose logs were not fetched.
+    Returns (teams, matrices dict, paired games).
+    """
+    games = pair_games(log)
+    present = set(games['TEAM_HOME']) | set(games['TEAM_AWAY'])
+    teams = [team for team in log['TEAM'].cat.categories if team in present]
+    n = len(teams)
+
+    home = pd.Categorical(games['TEAM_HOME'], categories=teams).codes.astype(np.intp)
+    away = pd.Categorical(games['TEAM_AWAY'], categories=teams).codes.astype(np.intp)
+    margin = games['PTS_HOME'].to_numpy(np.int32) - games['PTS_AWAY'].to_numpy(np.int32)
+
+    # Each game contributes to [home, away] and, mirrored, to [away, home]
+    rows = np.concatenate([home, away])
+    cols = np.concatenate([away, home])
+    flat = rows * n + cols
+    signed_margin = np.concatenate([margin, -margin])
+
+    count = np.bincount(flat, minlength=n * n).reshape(n, n)
+    wins = np.bincount(flat, weights=signed_margin > 0, minlength=n * n).reshape(n, n).astype(np.int32)
+    point_diff = np.bincount(flat, weights=signed_margin, minlength=n * n).reshape(n, n)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg_diff = np.where(count > 0, point_diff / count, np.nan)
+
+    matrices = {'wins': wins, 'games': count.astype(np.int32), 'point_diff': point_diff, 'avg_diff': avg_diff}
+    return teams, matrices, games
+
+
+def least_squares_ratings(log, matchups=None):
+    """
+    Opponent-adjusted ratings from paired games:
+
+    - rating: margin_home = r_home - r_away + home_advantage (Massey-style net rating,
+      ratings sum to zero)
+    - offense / defense: pts_team = league_avg + off_team - def_opp (+ home advantage)
+
+    Returns a DataFrame indexed by team, sorted by rating, plus the home advantage.
+    Pass a head_to_head(log) result as matchups to avoid recomputing it.
+    """
+    teams, matrices, games = matchups if matchups is not None else head_to_head(log)
+    n = len(teams)
+    n_games = len(games)
+    home = pd.Categorical(games['TEAM_HOME'], categories=teams).codes
+    away = pd.Categorical(games['TEAM_AWAY'], categories=teams).codes
+    pts_home = games['PTS_HOME'].to_numpy(np.float64)
+    pts_away = games['PTS_AWAY'].to_numpy(np.float64)
+    idx = np.arange(n_games)
+
+    # Net rating: lstsq returns the minimum-norm solution, which fixes sum(r) = 0
+    X = np.zeros((n_games, n + 1))
+    X[idx, home] = 1.0
+    X[idx, away] = -1.0
+    X[:, n] = 1.0
+    solution = np.linalg.lstsq(X, pts_home - pts_away, rcond=None)[0]
+    rating, home_advantage = solution[:n], solution[n]
+    rating = rating - rating.mean()
+
+    # Offense / defense: two equations per game, one per side
+    Y = np.zeros((2 * n_games, 2 * n + 1))
+    Y[idx, home] = 1.0
+    Y[idx, n + away] = -1.0
+    Y[idx, 2 * n] = 1.0
+    Y[n_games + idx, away] = 1.0
+    Y[n_games + idx, n + home] = -1.0
+    points = np.concatenate([pts_home, pts_away])
+    league_avg = points.mean()
+    solution = np.linalg.lstsq(Y, points - league_avg, rcond=None)[0]
+    offense, defense = solution[:n], solution[n:2 * n]
+    offense, defense = offense - offense.mean(), defense - defense.mean()
+
+    games_played = matrices['games'].sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        schedule = matrices['games'] @ rating / games_played
+
+    ratings = pd.DataFrame({
+        'games': games_played,
+        'wins': matrices['wins'].sum(axis=1),
+        'avg_margin': matrices['point_diff'].sum(axis=1) / np.maximum(games_played, 1),
+        'rating': rating,
+        'offense': offense,
+        'defense': defense,
+        'strength_of_schedule': schedule,
+    }, index=pd.Index(teams, name='TEAM'))
+    ratings = ratings[ratings['games'] > 0].sort_values('rating', ascending=False)
+    return ratings.round(2), round(float(home_advantage), 2)
+
+
+def head_to_head_summary(log):
+    """JSON-ready matrices and ratings for the HTML analyzer's heatmap"""
+    matchups = head_to_head(log)
+    teams, matrices, _ = matchups
+    ratings, home_advantage = least_squares_ratings(log, matchups)
+
+    def clean(matrix):
+        return [[None if np.isnan(v) else round(float(v), 1) for v in row] for row in matrix]
+
+    return {
+        'teams': teams,
+        'wins': matrices['wins'].tolist(),
+        'games': matrices['games'].tolist(),
+        'avg_diff': clean(matrices['avg_diff']),
+        'home_advantage': home_advantage,
+        'ratings': ratings.reset_index().to_dict(orient='records'),
+    }
+
+
+def main():
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'BENCHMARKS'))
+    import synthetic_data
+    from nba_game_log import normalize_game_log
+
+    print("League Head-to-Head Matrix")
+    print("=" * 40)
+
+    for n_seasons in [1, 10]:
+        log = normalize_game_log(synthetic_data.nba_league_log(n_seasons))
+        start = time.perf_counter()
+        ratings, home_advantage = least_squares_ratings(log)
+        elapsed = time.perf_counter() - start
+        print(f"\n{n_seasons} season(s), {len(log) // 2:,} games: matrices + ratings in {elapsed * 1000:.1f} ms")
+        print(f"Home advantage: {home_advantage:+.2f} pts")
+        print(ratings.head(5))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,21 +4,40 @@ NBA Team Game Results Visualizer with HTML Output
 Uses real NBA data for all teams with balanced home/away comparison
 """
 
-from nba_api.stats.endpoints import teamgamelog
-from nba_api.stats.static import teams
 from datetime import datetime, timedelta
-import pandas as pd
 import webbrowser
 import os
 import json
+import inspect
+import sys
 import time
 
+try:
+    from nba_api.stats.endpoints import teamgamelog
+    from nba_api.stats.static import teams
+except ImportError:
+    # Rendering helpers still work offline (e.g. from the benchmark suite)
+    print("nba_api not installed. Run: pip install nba_api")
+    teamgamelog = teams = None
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'PIPELINE'))
+from pipeline_trace import Tracer, profile
+from build_manifest import BuildManifest, fingerprint
+from http_transport import install as install_http_transport, bytes_received
+from nba_game_log import normalize_game_log, date_window, home_away_records, team_records, combine_logs
+from nba_head_to_head import head_to_head_summary
+
+# Stage timings for this run (written to METRICS_FILE at the end of main)
+tracer = Tracer('nba')
+METRICS_FILE = "nba_run_metrics.json"
+
 # CHANGE THIS VARIABLE TO VIEW DIFFERENT TEAMS
 team_name = "Golden State Warriors"
 
-def get_team_games(team_name, show_progress=True):
+def get_team_games(team_name, show_progress=True, season="2024-25", recent_days=180):
     """
     Get game results for any NBA team from the last 6 months
+    (pass recent_days=None to keep the whole season)
     """
     try:
         # Get team ID
@@ -32,59 +51,53 @@ def get_team_games(team_name, show_progress=True):
         team_id = team_info['id']
         
         # Calculate date 6 months ago
-        six_months_ago = datetime.now() - timedelta(days=180)
-        season = "2024-25"
+        six_months_ago = datetime.now() - timedelta(days=recent_days) if recent_days else None
         
         if show_progress:
             print(f"Fetching data for {team_name}...")
         
         # Get team game log
-        gamelog = teamgamelog.TeamGameLog(
-            team_id=team_id,
-            season=season,
-            season_type_all_star='Regular Season'
-        )
+        with tracer.span('fetch', team=team_name) as span:
+            received = bytes_received()
+            gamelog = teamgamelog.TeamGameLog(
+                team_id=team_id,
+                season=season,
+                season_type_all_star='Regular Season'
+            )
+            span.add(bytes=bytes_received() - received)
         
         # Get games data
-        games_df = gamelog.get_data_frames()[0]
+        with tracer.span('parse', team=team_name) as span:
+            games_df = gamelog.get_data_frames()[0]
+            span.add(rows=len(games_df))
         
         if games_df.empty:
             if show_progress:
                 print(f"No games found for {team_name} in {season} season")
             return None
         
-        # Convert GAME_DATE to datetime
-        try:
-            games_df['GAME_DATE'] = pd.to_datetime(games_df['GAME_DATE'])
-        except:
-            games_df['GAME_DATE'] = pd.to_datetime(games_df['GAME_DATE'], format='%Y-%m-%d')
+        # Normalize once: MATCHUP -> OPP/HOME, WL -> WIN, sorted GAME_DATE index
+        games_log = normalize_game_log(games_df)
         
         # Filter games from last 6 months
-        recent_games = games_df[games_df['GAME_DATE'] >= six_months_ago]
+        recent_games = date_window(games_log, start=six_months_ago)
         
         if recent_games.empty:
             if show_progress:
                 print(f"No recent games found for {team_name} in the last 6 months")
             return None
         
-        # Sort by date (most recent first)
-        recent_games = recent_games.sort_values('GAME_DATE', ascending=False)
-        
         if show_progress:
             # Calculate home/away records for display
-            home_games = recent_games[recent_games['MATCHUP'].str.contains('vs', na=False)]
-            away_games = recent_games[recent_games['MATCHUP'].str.contains('@', na=False)]
-            
-            home_wins = len(home_games[home_games['WL'] == 'W'])
-            home_losses = len(home_games[home_games['WL'] == 'L'])
-            away_wins = len(away_games[away_games['WL'] == 'W'])
-            away_losses = len(away_games[away_games['WL'] == 'L'])
+            record = home_away_records(recent_games).iloc[0]
+            home_games = record['home_wins'] + record['home_losses']
+            away_games = record['away_wins'] + record['away_losses']
             
-            total_wins = recent_games['WL'].value_counts().get('W', 0)
-            total_losses = recent_games['WL'].value_counts().get('L', 0)
+            total_wins = int(recent_games['WIN'].sum())
+            total_losses = len(recent_games) - total_wins
             
             print(f"  Total Games: {len(recent_games)} | Record: {total_wins}-{total_losses}")
-            print(f"  Home: {home_wins}-{home_losses} ({len(home_games)} games) | Away: {away_wins}-{away_losses} ({len(away_games)} games)")
+            print(f"  Home: {record['home_wins']}-{record['home_losses']} ({home_games} games) | Away: {record['away_wins']}-{record['away_losses']} ({away_games} games)")
         
         return recent_games
         
@@ -94,28 +107,23 @@ def get_team_games(team_name, show_progress=True):
         return None
 
 def process_team_data(team_data):
-    """Convert team data to JavaScript format"""
-    if team_data is None:
+    """Convert a team's normalized game log to JavaScript format (most recent first)"""
+    if team_data is None or team_data.empty:
         return []
     
-    processed_data = []
-    for _, game in team_data.iterrows():
-        processed_data.append({
-            'GAME_DATE': game['GAME_DATE'].strftime('%Y-%m-%d'),
-            'PTS': int(game['PTS']) if pd.notna(game['PTS']) else 0,
-            'HOME_AWAY': 'Home' if 'vs' in str(game['MATCHUP']) else 'Away',
-            'WL': game['WL']
-        })
-    
-    return processed_data
+    return next(iter(team_records(team_data).values()), [])
 
-def get_all_teams_data():
-    """Fetch real NBA data for all teams"""
+def get_all_teams_data(season="2024-25", recent_days=180, return_log=False):
+    """
+    Fetch real NBA data for all teams
+    (return_log=True also returns the combined normalized league log)
+    """
     print("Fetching real NBA data for all teams...")
     print("This may take a few minutes due to API rate limits...")
     print("=" * 60)
     
     all_teams_data = {}
+    team_logs = []
 
     # nba_teams= ["Golden State Warriors","Toronto Raptors"]
     
@@ -147,10 +155,13 @@ def get_all_teams_data():
         team_full_name = team['full_name']
         
         # Get team data
-        team_data = get_team_games(team_full_name, show_progress=True)
+        team_data = get_team_games(team_full_name, show_progress=True, season=season, recent_days=recent_days)
         
         if team_data is not None:
-            all_teams_data[team_full_name] = process_team_data(team_data)
+            with tracer.span('aggregate', team=team_full_name) as span:
+                all_teams_data[team_full_name] = process_team_data(team_data)
+                span.add(rows=len(team_data))
+            team_logs.append(team_data)
             successful_teams += 1
         
         # Add delay to respect NBA API rate limits
@@ -162,10 +173,72 @@ def get_all_teams_data():
     
     print("=" * 60)
     print(f"Successfully fetched data for {successful_teams} teams")
+    if return_log:
+        return all_teams_data, combine_logs(team_logs) if team_logs else None
     return all_teams_data
 
-def visualize_team_games(all_teams_data, initial_team):
-    """Create interactive HTML chart with real data for all teams"""
+def build_head_to_head_html(head_to_head):
+    """Heatmap + ratings table section for league-wide head-to-head results"""
+    return f"""
+            <h2>League Head-to-Head</h2>
+            <div class="info">
+                <strong>Opponent-Adjusted Ratings:</strong> Least-squares point margins over every game
+                between fetched teams (home advantage: {head_to_head['home_advantage']:+.1f} pts).
+            </div>
+            <div class="controls">
+                <label for="h2hMetric">Show: </label>
+                <select id="h2hMetric" onchange="updateHeadToHead()">
+                    <option value="avg_diff" selected>Average point differential</option>
+                    <option value="wins">Wins</option>
+                    <option value="games">Games played</option>
+                </select>
+            </div>
+            <div id="h2h"></div>
+            <div id="ratings"></div>
+            
+            <script>
+                const headToHead = {json.dumps(head_to_head)};
+                
+                function updateHeadToHead() {{
+                    const metric = document.getElementById('h2hMetric').value;
+                    const trace = {{
+                        z: headToHead[metric],
+                        x: headToHead.teams,
+                        y: headToHead.teams,
+                        type: 'heatmap',
+                        colorscale: metric === 'avg_diff' ? 'RdBu' : 'Blues',
+                        reversescale: metric !== 'avg_diff',
+                        zmid: metric === 'avg_diff' ? 0 : undefined,
+                        hovertemplate: '%{{y}} vs %{{x}}: %{{z}}<extra></extra>'
+                    }};
+                    const layout = {{
+                        title: {{ text: 'Row team vs column opponent', font: {{ size: 16 }} }},
+                        xaxis: {{ side: 'top', tickangle: -45 }},
+                        yaxis: {{ autorange: 'reversed' }},
+                        height: 750,
+                        template: 'plotly_white'
+                    }};
+                    Plotly.newPlot('h2h', [trace], layout, {{responsive: true}});
+                }}
+                
+                const ratingRows = headToHead.ratings.map(r => `
+                    <tr><td>${{r.TEAM}}</td><td>${{r.games}}</td><td>${{r.wins}}</td><td>${{r.avg_margin}}</td>
+                    <td><strong>${{r.rating}}</strong></td><td>${{r.offense}}</td><td>${{r.defense}}</td>
+                    <td>${{r.strength_of_schedule}}</td></tr>`).join('');
+                document.getElementById('ratings').innerHTML = `
+                    <table class="stats" style="width:100%; text-align:right;">
+                        <tr><th>Team</th><th>Games</th><th>Wins</th><th>Avg Margin</th><th>Rating</th>
+                        <th>Offense</th><th>Defense</th><th>Schedule</th></tr>
+                        ${{ratingRows}}
+                    </table>`;
+                
+                updateHeadToHead();
+            </script>
+    """
+
+
+def build_html(all_teams_data, initial_team, head_to_head=None):
+    """Return the interactive HTML page for all teams as a string"""
     
     # Get sorted list of teams
     available_teams = sorted(all_teams_data.keys())
@@ -174,7 +247,7 @@ def visualize_team_games(all_teams_data, initial_team):
         initial_team = available_teams[0]
         print(f"Initial team not available, using {initial_team} instead")
     
-    html_content = f"""
+    return f"""
     <!DOCTYPE html>
     <html>
     <head>
@@ -258,6 +331,7 @@ def visualize_team_games(all_teams_data, initial_team):
             
             <div id="stats"></div>
             <div id="chart"></div>
+            {build_head_to_head_html(head_to_head) if head_to_head else ""}
         </div>
         
         <script>
@@ -412,16 +486,35 @@ def visualize_team_games(all_teams_data, initial_team):
     </body>
     </html>
     """
-    
-    # Save HTML file
+
+def visualize_team_games(all_teams_data, initial_team, head_to_head=None):
+    """Create interactive HTML chart with real data for all teams"""
     filename = "nba_real_data_analyzer.html"
+    
+    # Hash the data and the page template; unchanged inputs mean the page is already up to date
+    digest = fingerprint(all_teams_data, initial_team, head_to_head,
+                         inspect.getsource(build_html), inspect.getsource(build_head_to_head_html))
+    manifest = BuildManifest()
+    
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        
-        print(f"\nInteractive HTML page saved as: {filename}")
-        print(f"Real NBA data loaded for {len(all_teams_data)} teams")
-        print("Features: Real NBA data with balanced home/away comparison")
+        with tracer.span('render') as span:
+            if manifest.is_current(filename, digest):
+                span.add(cache_hit=True)
+                print(f"\nData unchanged since last run, keeping: {filename}")
+            else:
+                span.add(cache_hit=False)
+                html_content = build_html(all_teams_data, initial_team, head_to_head)
+                span.add(bytes=len(html_content), rows=len(all_teams_data))
+                
+                # Save HTML file
+                with open(filename, 'w', encoding='utf-8') as f:
+                    f.write(html_content)
+                manifest.record(filename, digest)
+                manifest.save()
+                
+                print(f"\nInteractive HTML page saved as: {filename}")
+                print(f"Real NBA data loaded for {len(all_teams_data)} teams")
+                print("Features: Real NBA data with balanced home/away comparison")
         
         # Open in browser
         webbrowser.open('file://' + os.path.realpath(filename))
@@ -434,15 +527,30 @@ def main():
     print("Real NBA Data for All Teams")
     print("=" * 40)
     
-    # Fetch real data for all teams
-    all_teams_data = get_all_teams_data()
+    # HTTP_MODE=record|replay captures or replays NBA API responses (default: live)
+    install_http_transport()
     
-    if not all_teams_data:
-        print("No team data was successfully fetched. Please check your internet connection and try again.")
-        return
+    # --profile also dumps cProfile / tracemalloc hot spots to ./profile
+    with profile(enabled='--profile' in sys.argv):
+        # Fetch real data for all teams
+        all_teams_data, league_log = get_all_teams_data(return_log=True)
+        
+        if not all_teams_data:
+            print("No team data was successfully fetched. Please check your internet connection and try again.")
+            return
+        
+        # League-wide head-to-head matrices and opponent-adjusted ratings
+        with tracer.span('aggregate', step='head_to_head') as span:
+            head_to_head = head_to_head_summary(league_log)
+            span.add(rows=len(league_log))
+        
+        # Create visualization with all real data
+        visualize_team_games(all_teams_data, team_name, head_to_head)
     
-    # Create visualization with all real data
-    visualize_team_games(all_teams_data, team_name)
+    tracer.print_summary()
+    tracer.write_json(METRICS_FILE)
+    tracer.write_prometheus(METRICS_FILE.replace('.json', '.prom'))
+    print(f"Run metrics saved as: {METRICS_FILE}")
 
 if __name__ == "__main__":
     main()
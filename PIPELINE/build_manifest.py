@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Content-Hash Build Manifest
+Report generators hash their input data plus template/version and only
+re-render outputs whose hash changed since the last run
+"""
+
+import hashlib
+import json
+import os
+
+MANIFEST_FILE = "build_manifest.json"
+
+
+def _update(digest, value):
+    """Feed a value into the hash in a stable, type-aware way"""
+    if isinstance(value, bytes):
+        digest.update(value)
+    elif isinstance(value, str):
+        digest.update(value.encode('utf-8'))
+    elif hasattr(value, 'to_json') and hasattr(value, 'data'):
+        # Plotly figure: data + layout fully describe the rendered output
+        digest.update(value.to_json().encode('utf-8'))
+    elif type(value).__module__.startswith('pandas'):
+        import pandas as pd
+        digest.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+        digest.update(repr(list(getattr(value, 'columns', [getattr(value, 'name', None)]))).encode('utf-8'))
+    else:
+        digest.update(json.dumps(value, sort_keys=True, default=str).encode('utf-8'))
+
+
+def fingerprint(*inputs):
+    """SHA-256 over any mix of bytes, str, JSON-able data, DataFrames and figures"""
+    digest = hashlib.sha256()
+    for value in inputs:
+        _update(digest, value)
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class BuildManifest:
+    """Maps output paths to the hash of the inputs they were built from"""
+
+    def __init__(self, path=MANIFEST_FILE):
+        self.path = path
+        try:
+            with open(path, 'r') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def is_current(self, output, digest):
+        """True if output exists and was built from exactly these inputs"""
+        entry = self.entries.get(output)
+        return entry is not None and entry['hash'] == digest and os.path.exists(output)
+
+    def record(self, output, digest):
+        self.entries[output] = {'hash': digest, 'size': os.path.getsize(output)}
+
+    def save(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def build(self, output, digest, render):
+        """
+        Call render(output) only if the output is stale, then record it.
+        Returns True if the output was (re)built.
+        """
+        if self.is_current(output, digest):
+            print(f"Unchanged, skipping: {output}")
+            return False
+        render(output)
+        self.record(output, digest)
+        self.save()
+        return True
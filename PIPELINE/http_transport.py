@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Record / Replay HTTP Transport
+One switch for every requests-based client in the repo (nba_api, pycoingecko,
+requests.get in the WEBDATA notebooks):
+
+- live:   talk to the real services (default, same as before)
+- record: talk to the real services and save every response to a gzip cassette
+- replay: serve responses from cassettes only, with optional injected latency
+          and error rate, so pipelines run and benchmark with no network
+
+Select the mode in code with install('replay') or from the environment:
+    HTTP_MODE=record python nba_team_visualizer.py
+    HTTP_MODE=replay HTTP_LATENCY=0.05 HTTP_ERROR_RATE=0.02 python nba_team_visualizer.py
+
+Whether a request fails is decided by hashing HTTP_SEED (default 0) with the
+request key and how many times that request has been sent, so a replay run
+with the same settings fails the same requests every time, regardless of the
+order threads send them in, and a retried request can still succeed.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+MODES = ('live', 'record', 'replay')
+DEFAULT_SEED = 0
+CASSETTE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cassettes')
+
+# Headers that describe the wire encoding rather than the body we store
+_DROP_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length', 'connection'}
+
+_original_send = HTTPAdapter.send
+_active = None
+_received = threading.local()  # per-thread byte count; requests sends on the calling thread
+
+
+def bytes_received():
+    """
+    Response bytes received by this thread through the installed transport
+    (Content-Length when the server sends it, otherwise the body length).
+    Take the difference around a block to measure its transfer size.
+    """
+    return getattr(_received, 'bytes', 0)
+
+
+def _add_received(response, stream):
+    length = response.headers.get('Content-Length')
+    if length is not None and length.isdigit():
+        size = int(length)
+    elif not stream:
+        size = len(response.content)  # requests reads non-streamed bodies right away anyway
+    else:
+        size = 0  # streamed body of unknown length; left for the caller to count
+    _received.bytes = bytes_received() + size
+
+
+def canonical_url(url):
+    """URL with query parameters sorted, so equivalent requests share a cassette"""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, query, ''))
+
+
+def request_key(method, url, body=None):
+    digest = hashlib.sha256(f"{method.upper()} {canonical_url(url)}".encode('utf-8'))
+    if body:
+        digest.update(body if isinstance(body, bytes) else str(body).encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+
+class Transport:
+    """Holds the mode and cassette settings; installed by patching HTTPAdapter.send"""
+
+    def __init__(self, mode='live', cassette_dir=CASSETTE_DIR, latency=0.0, error_rate=0.0,
+                 error_status=None, seed=DEFAULT_SEED):
+        if mode not in MODES:
+            raise ValueError(f"Unknown HTTP mode '{mode}', expected one of {MODES}")
+        self.mode = mode
+        self.cassette_dir = cassette_dir
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status  # None raises ConnectionError, e.g. 503 returns that status
+        self.seed = seed
+        self.attempts = {}  # request key -> number of times it has been sent
+        self.lock = threading.Lock()
+        self.stats = {'live': 0, 'recorded': 0, 'replayed': 0, 'missing': 0, 'injected_errors': 0}
+
+    def cassette_path(self, method, url, body=None):
+        host = urlsplit(url).netloc.lower().replace(':', '_') or 'local'
+        return os.path.join(self.cassette_dir, host, f"{request_key(method, url, body)}.json.gz")
+
+    def save(self, request, status, reason, headers, body):
+        path = self.cassette_path(request.method, request.url, request.body)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        cassette = {
+            'request': {'method': request.method, 'url': request.url},
+            'response': {
+                'status': status,
+                'reason': reason,
+                'headers': {k: v for k, v in headers.items() if k.lower() not in _DROP_HEADERS},
+                'body': body.decode('latin-1'),
+            },
+            'recorded': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        tmp_path = path + '.tmp'
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(cassette, f)
+        os.replace(tmp_path, path)
+
+    def load(self, method, url, body=None):
+        """Return the stored response dict, or None if nothing was recorded"""
+        path = self.cassette_path(method, url, body)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                response = json.load(f)['response']
+        except FileNotFoundError:
+            return None
+        response['body'] = response['body'].encode('latin-1')
+        return response
+
+    def _count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+
+    def _inject(self, method, url, body=None):
+        """Sleep for the configured latency; return True if this request should fail"""
+        if self.latency:
+            time.sleep(self.latency)
+        if self.error_rate <= 0:
+            return False
+        key = request_key(method, url, body)
+        with self.lock:
+            attempt = self.attempts.get(key, 0)
+            self.attempts[key] = attempt + 1
+        digest = hashlib.sha256(f"{self.seed}:{key}:{attempt}".encode('utf-8')).digest()
+        failed = int.from_bytes(digest[:8], 'big') / 2 ** 64 < self.error_rate
+        if failed:
+            self._count('injected_errors')
+        return failed
+
+    @staticmethod
+    def _build(adapter, request, status, reason, headers, body):
+        raw = HTTPResponse(body=io.BytesIO(body), headers=headers, status=status, reason=reason,
+                           preload_content=False, decode_content=False)
+        return adapter.build_response(request, raw)
+
+    def send(self, adapter, request, **kwargs):
+        response = self._send(adapter, request, **kwargs)
+        _add_received(response, kwargs.get('stream', False))
+        return response
+
+    def _send(self, adapter, request, **kwargs):
+        if self.mode == 'live':
+            self._count('live')
+            return _original_send(adapter, request, **kwargs)
+
+        if self.mode == 'record':
+            response = _original_send(adapter, request, **kwargs)
+            body = response.content  # read fully so it can be stored and replayed
+            self.save(request, response.status_code, response.reason, response.headers, body)
+            self._count('recorded')
+            headers = {k: v for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS}
+            return self._build(adapter, request, response.status_code, response.reason, headers, body)
+
+        # replay
+        if self._inject(request.method, request.url, request.body):
+            if self.error_status is None:
+                raise requests.ConnectionError(f"Injected failure for {request.url}", request=request)
+            return self._build(adapter, request, self.error_status, 'Injected Error', {}, b'')
+
+        cassette = self.load(request.method, request.url, request.body)
+        if cassette is None:
+            self._count('missing')
+            raise requests.ConnectionError(
+                f"No cassette for {request.method} {request.url} (record it with HTTP_MODE=record)",
+                request=request)
+        self._count('replayed')
+        return self._build(adapter, request, cassette['status'], cassette['reason'],
+                           cassette['headers'], cassette['body'])
+
+
+def install(mode=None, **kwargs):
+    """
+    Route every requests call through a Transport. Arguments default to the
+    HTTP_MODE, HTTP_CASSETTE_DIR, HTTP_LATENCY, HTTP_ERROR_RATE and HTTP_SEED environment variables.
+    """
+    global _active
+    mode = mode or os.environ.get('HTTP_MODE', 'live')
+    kwargs.setdefault('cassette_dir', os.environ.get('HTTP_CASSETTE_DIR', CASSETTE_DIR))
+    kwargs.setdefault('latency', float(os.environ.get('HTTP_LATENCY', 0)))
+    kwargs.setdefault('error_rate', float(os.environ.get('HTTP_ERROR_RATE', 0)))
+    kwargs.setdefault('seed', int(os.environ.get('HTTP_SEED', DEFAULT_SEED)))
+
+    _active = Transport(mode, **kwargs)
+
+    def send(adapter, request, **send_kwargs):
+        return _active.send(adapter, request, **send_kwargs)
+
+    HTTPAdapter.send = send
+    if mode != 'live':
+        print(f"HTTP transport: {mode} ({_active.cassette_dir})")
+    return _active
+
+
+def uninstall():
+    """Restore the original requests behaviour"""
+    global _active
+    HTTPAdapter.send = _original_send
+    _active = None
+
+
+@contextmanager
+def http_mode(mode, **kwargs):
+    """Temporarily install a transport: with http_mode('replay', latency=0.1): ..."""
+    previous = _active
+    transport = install(mode, **kwargs)
+    try:
+        yield transport
+    finally:
+        if previous is None:
+            uninstall()
+        else:
+            install(previous.mode, cassette_dir=previous.cassette_dir, latency=previous.latency,
+                    error_rate=previous.error_rate, error_status=previous.error_status, seed=previous.seed)
+
+
+class CassetteHandler(BaseHTTPRequestHandler):
+    """
+    Local HTTP stand-in for clients that do not use requests.
+    GET http://127.0.0.1:<port>/<original host>/<path>?<query> replays the
+    cassette recorded for https://<original host>/<path>?<query>.
+    """
+
+    transport = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        host, _, rest = self.path.lstrip('/').partition('/')
+        url = f"https://{host}/{rest}"
+
+        if self.transport._inject('GET', url):
+            self.send_error(self.transport.error_status or 503, "Injected Error")
+            return
+
+        cassette = self.transport.load('GET', url)
+        if cassette is None:
+            self.transport._count('missing')
+            self.send_error(404, f"No cassette for {url}")
+            return
+
+        self.transport._count('replayed')
+        self.send_response(cassette['status'], cassette['reason'])
+        for name, value in cassette['headers'].items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(cassette['body'])))
+        self.end_headers()
+        self.wfile.write(cassette['body'])
+
+
+def serve_cassettes(cassette_dir=CASSETTE_DIR, port=0, latency=0.0, error_rate=0.0, seed=DEFAULT_SEED):
+    """Start the replay stand-in in a background thread; returns the server"""
+    transport = Transport('replay', cassette_dir, latency=latency, error_rate=error_rate, seed=seed)
+    handler = type('BoundCassetteHandler', (CassetteHandler,), {'transport': transport})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
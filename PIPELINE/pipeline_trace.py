@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Pipeline Stage Tracing
+Lightweight spans around fetch / parse / aggregate / render stages that record
+wall and CPU time, bytes transferred, rows processed and cache hits, with a
+run summary exported as JSON or Prometheus text format
+"""
+
+import cProfile
+import functools
+import json
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class Span:
+    """Measurements for one execution of a stage"""
+
+    def __init__(self, stage, **labels):
+        self.stage = stage
+        self.labels = labels
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.bytes = 0
+        self.rows = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.error = None
+
+    def add(self, bytes=0, rows=0, cache_hit=None):
+        """Record work done inside the span; cache_hit=True/False counts a lookup"""
+        self.bytes += bytes
+        self.rows += rows
+        if cache_hit is True:
+            self.cache_hits += 1
+        elif cache_hit is False:
+            self.cache_misses += 1
+
+
+class Tracer:
+    """Collects spans for one pipeline run"""
+
+    def __init__(self, run_name='pipeline'):
+        self.run_name = run_name
+        self.spans = []
+        self.started = time.time()
+
+    @contextmanager
+    def span(self, stage, **labels):
+        """
+        Time a block of code:
+
+            with tracer.span('fetch', team=team_name) as s:
+                ...
+                s.add(bytes=len(body), rows=len(df))
+        """
+        current = Span(stage, **labels)
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield current
+        except Exception as e:
+            current.error = type(e).__name__
+            raise
+        finally:
+            current.wall = time.perf_counter() - wall_start
+            current.cpu = time.process_time() - cpu_start
+            self.spans.append(current)
+
+    def traced(self, stage):
+        """Decorator form of span(); rows are taken from len(result) when possible"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(stage) as current:
+                    result = func(*args, **kwargs)
+                    try:
+                        current.add(rows=len(result))
+                    except TypeError:
+                        pass
+                    return result
+            return wrapper
+        return decorator
+
+    def summary(self):
+        """Per-stage totals for the run"""
+        stages = {}
+        for s in self.spans:
+            totals = stages.setdefault(s.stage, {
+                'count': 0, 'errors': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0,
+                'bytes': 0, 'rows': 0, 'cache_hits': 0, 'cache_misses': 0,
+            })
+            totals['count'] += 1
+            totals['errors'] += s.error is not None
+            totals['wall_seconds'] += s.wall
+            totals['cpu_seconds'] += s.cpu
+            totals['bytes'] += s.bytes
+            totals['rows'] += s.rows
+            totals['cache_hits'] += s.cache_hits
+            totals['cache_misses'] += s.cache_misses
+
+        for totals in stages.values():
+            lookups = totals['cache_hits'] + totals['cache_misses']
+            totals['cache_hit_rate'] = totals['cache_hits'] / lookups if lookups else None
+
+        return {
+            'run': self.run_name,
+            'started': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started)),
+            'total_seconds': time.time() - self.started,
+            'stages': stages,
+            'spans': [
+                {'stage': s.stage, 'labels': s.labels, 'wall_seconds': s.wall, 'cpu_seconds': s.cpu,
+                 'bytes': s.bytes, 'rows': s.rows, 'error': s.error}
+                for s in self.spans
+            ],
+        }
+
+    def write_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+        return path
+
+    def write_prometheus(self, path):
+        """Prometheus text exposition format (e.g. for node_exporter's textfile collector)"""
+        metrics = [
+            ('wall_seconds', 'pipeline_stage_wall_seconds', 'Wall-clock time spent in stage'),
+            ('cpu_seconds', 'pipeline_stage_cpu_seconds', 'CPU time spent in stage'),
+            ('bytes', 'pipeline_stage_bytes', 'Bytes transferred in stage'),
+            ('rows', 'pipeline_stage_rows', 'Rows processed in stage'),
+            ('count', 'pipeline_stage_spans', 'Number of times the stage ran'),
+            ('errors', 'pipeline_stage_errors', 'Number of failed stage executions'),
+            ('cache_hit_rate', 'pipeline_stage_cache_hit_ratio', 'Cache hit ratio for stage'),
+        ]
+        stages = self.summary()['stages']
+        lines = []
+        for key, name, help_text in metrics:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for stage, totals in stages.items():
+                if totals[key] is not None:
+                    lines.append(f'{name}{{run="{self.run_name}",stage="{stage}"}} {totals[key]}')
+        with open(path, 'w') as f:
+            f.write("\n".join(lines) + "\n")
+        return path
+
+    def write(self, path):
+        """Write JSON, or Prometheus text if path ends in .prom"""
+        if path.endswith('.prom'):
+            return self.write_prometheus(path)
+        return self.write_json(path)
+
+    def print_summary(self):
+        print(f"\nRun summary ({self.run_name}):")
+        for stage, totals in self.summary()['stages'].items():
+            hit_rate = totals['cache_hit_rate']
+            print(f"   {stage:<10} x{totals['count']:<4} wall {totals['wall_seconds']:8.2f}s  "
+                  f"cpu {totals['cpu_seconds']:7.2f}s  rows {totals['rows']:<7} "
+                  f"bytes {totals['bytes']:<10}"
+                  + (f" cache {hit_rate * 100:.0f}%" if hit_rate is not None else ""))
+
+
+class Profiler:
+    """
+    cProfile + tracemalloc around a section of a script.
+    stop() writes <output_dir>/cpu.prof, cpu.txt and memory.txt.
+    """
+
+    def __init__(self, output_dir='profile', top=25):
+        self.output_dir = output_dir
+        self.top = top
+        self.profiler = cProfile.Profile()
+
+    def start(self):
+        tracemalloc.start()
+        self.profiler.enable()
+        return self
+
+    def stop(self):
+        self.profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.profiler.dump_stats(os.path.join(self.output_dir, 'cpu.prof'))
+        with open(os.path.join(self.output_dir, 'cpu.txt'), 'w') as f:
+            pstats.Stats(self.profiler, stream=f).sort_stats('cumulative').print_stats(self.top)
+        with open(os.path.join(self.output_dir, 'memory.txt'), 'w') as f:
+            f.write(f"Peak traced memory: {peak / 2**20:.1f} MB\n\n")
+            for stat in snapshot.statistics('lineno')[:self.top]:
+                f.write(f"{stat}\n")
+        print(f"Profile written to {self.output_dir}/")
+
+
+@contextmanager
+def profile(enabled=True, output_dir='profile', top=25):
+    """Context-manager form of Profiler; does nothing when enabled is False"""
+    if not enabled:
+        yield
+        return
+
+    profiler = Profiler(output_dir, top).start()
+    try:
+        yield
+    finally:
+        profiler.stop()
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Streaming File Downloader
+Streams files to disk in fixed-size chunks, resumes partial downloads with
+HTTP Range, verifies checksums and skips files that have not changed
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+CHUNK_SIZE = 1024 * 1024  # 1 MB
+TIMEOUT = 30              # seconds, for connect and for each read
+MAX_WORKERS = 4
+
+_local = threading.local()
+
+
+def _session():
+    """One requests.Session per worker thread"""
+    if not hasattr(_local, 'session'):
+        _local.session = requests.Session()
+    return _local.session
+
+
+def _read_meta(filename):
+    try:
+        with open(filename + '.meta', 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_meta(filename, meta):
+    with open(filename + '.meta', 'w') as f:
+        json.dump(meta, f)
+
+
+def _remove_meta(filename):
+    try:
+        os.remove(filename + '.meta')
+    except FileNotFoundError:
+        pass
+
+
+def file_sha256(filename, chunk_size=CHUNK_SIZE):
+    """Hash a file on disk without loading it into memory"""
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_unchanged(url, filename, session=None, timeout=TIMEOUT):
+    """
+    Check a previously completed download against the server's ETag / size.
+    A pending .part file means a newer download was interrupted, so never skip.
+    """
+    meta = _read_meta(filename)
+    if meta.get('size') is None or not os.path.exists(filename) or os.path.exists(filename + '.part'):
+        return False
+
+    session = session or _session()
+    head = session.head(url, allow_redirects=True, timeout=timeout)
+    if head.status_code != 200:
+        return False
+
+    etag = head.headers.get('ETag')
+    if etag and meta.get('etag'):
+        return etag == meta['etag']
+
+    length = head.headers.get('Content-Length')
+    return length is not None and int(length) == os.path.getsize(filename) == meta.get('size')
+
+
+def download(url, filename, sha256=None, chunk_size=CHUNK_SIZE, timeout=TIMEOUT, session=None):
+    """
+    Download url to filename.
+
+    Returns 'skipped', 'downloaded' or 'resumed'. Raises requests.HTTPError on
+    a bad response and ValueError if the sha256 checksum does not match.
+    """
+    session = session or _session()
+
+    if is_unchanged(url, filename, session=session, timeout=timeout):
+        if sha256 is None or file_sha256(filename) == sha256:
+            return 'skipped'
+
+    directory = os.path.dirname(filename)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # In-progress state lives in <part>.meta; <filename>.meta only describes the completed file
+    part = filename + '.part'
+    meta = _read_meta(part)
+    offset = os.path.getsize(part) if os.path.exists(part) else 0
+
+    headers = {}
+    if offset:
+        headers['Range'] = f'bytes={offset}-'
+        if meta.get('etag'):
+            # Server sends the whole file instead if it changed in the meantime
+            headers['If-Range'] = meta['etag']
+
+    with session.get(url, headers=headers, stream=True, timeout=timeout) as response:
+        if response.status_code == 416:
+            # Partial file is already complete (or bogus); start over
+            os.remove(part)
+            _remove_meta(part)
+            return download(url, filename, sha256, chunk_size, timeout, session)
+        response.raise_for_status()
+
+        resumed = offset > 0 and response.status_code == 206
+        digest = hashlib.sha256()
+        if resumed:
+            with open(part, 'rb') as f:
+                for chunk in iter(lambda: f.read(chunk_size), b''):
+                    digest.update(chunk)
+        else:
+            offset = 0
+
+        # Remember the ETag before writing so an interrupted run can resume safely
+        etag = response.headers.get('ETag')
+        _write_meta(part, {'url': url, 'etag': etag})
+
+        with open(part, 'ab' if resumed else 'wb') as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                f.write(chunk)
+                digest.update(chunk)
+
+    if sha256 is not None and digest.hexdigest() != sha256:
+        os.remove(part)
+        _remove_meta(part)
+        raise ValueError(f"Checksum mismatch for {filename}")
+
+    os.replace(part, filename)
+    _write_meta(filename, {'url': url, 'etag': etag, 'size': os.path.getsize(filename),
+                           'sha256': digest.hexdigest()})
+    _remove_meta(part)
+    return 'resumed' if resumed else 'downloaded'
+
+
+def download_all(jobs, max_workers=MAX_WORKERS, **kwargs):
+    """
+    Download a list of (url, filename) or (url, filename, sha256) jobs
+    with a bounded thread pool. Returns {filename: status or exception}.
+    """
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {}
+        for job in jobs:
+            url, filename = job[0], job[1]
+            sha256 = job[2] if len(job) > 2 else None
+            futures[pool.submit(download, url, filename, sha256, **kwargs)] = filename
+
+        for future in as_completed(futures):
+            filename = futures[future]
+            try:
+                results[filename] = future.result()
+            except Exception as e:
+                results[filename] = e
+            print(f"  {filename}: {results[filename]}")
+    return results
+
+
+class RangeRequestHandler(SimpleHTTPRequestHandler):
+    """Static file handler with single-range 'Range: bytes=N-' support and ETags"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            return super().send_head()
+
+        stat = os.stat(path)
+        size = stat.st_size
+        etag = f'"{stat.st_mtime_ns:x}-{size:x}"'
+        start = 0
+
+        range_header = self.headers.get('Range')
+        if_range = self.headers.get('If-Range')
+        if range_header and range_header.startswith('bytes=') and if_range in (None, etag):
+            start = int(range_header[len('bytes='):].split('-')[0] or 0)
+            if start >= size:
+                self.send_error(416, "Requested Range Not Satisfiable")
+                return None
+
+        f = open(path, 'rb')
+        f.seek(start)
+        self.send_response(206 if start else 200)
+        self.send_header('Content-Type', self.guess_type(path))
+        self.send_header('Content-Length', str(size - start))
+        self.send_header('ETag', etag)
+        self.send_header('Accept-Ranges', 'bytes')
+        if start:
+            self.send_header('Content-Range', f'bytes {start}-{size - 1}/{size}')
+        self.end_headers()
+        return f
+
+    def copyfile(self, source, outputfile):
+        try:
+            super().copyfile(source, outputfile)
+        except (ConnectionResetError, BrokenPipeError):
+            pass  # client dropped the connection mid-body; it will resume with Range
+
+
+def serve_directory(directory, port=0):
+    """Start a local range-capable HTTP server in a background thread"""
+    handler = lambda *args, **kwargs: RangeRequestHandler(*args, directory=directory, **kwargs)
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class _InterruptingSession(requests.Session):
+    """Session whose streamed bodies drop the connection after max_chunks chunks"""
+
+    def __init__(self, max_chunks=1):
+        super().__init__()
+        self.max_chunks = max_chunks
+
+    def get(self, url, **kwargs):
+        response = super().get(url, **kwargs)
+        iter_content = response.iter_content
+        max_chunks = self.max_chunks
+
+        def interrupted(*args, **kw):
+            for i, chunk in enumerate(iter_content(*args, **kw)):
+                if i == max_chunks:
+                    raise requests.ConnectionError("Simulated interruption")
+                yield chunk
+
+        response.iter_content = interrupted
+        return response
+
+
+def interrupt_check(source_dir, target_dir, size_mb=4):
+    """
+    Interrupt downloads against the local server and check that the next run
+    resumes (unchanged file) or restarts (changed file) instead of skipping.
+    """
+    server = serve_directory(source_dir)
+    url = f"http://127.0.0.1:{server.server_address[1]}/interrupt.bin"
+    source = os.path.join(source_dir, 'interrupt.bin')
+    target = os.path.join(target_dir, 'interrupt.bin')
+    for path in [target, target + '.meta', target + '.part', target + '.part.meta']:
+        if os.path.exists(path):
+            os.remove(path)
+
+    def write_source():
+        with open(source, 'wb') as f:
+            f.write(os.urandom(size_mb * 1024 * 1024))
+        return file_sha256(source)
+
+    def interrupted_download(sha256):
+        try:
+            download(url, target, sha256, session=_InterruptingSession())
+        except requests.ConnectionError:
+            return
+        raise AssertionError("download was not interrupted")
+
+    checks = []
+    try:
+        # 1. Fresh download interrupted, then resumed with Range
+        sha256 = write_source()
+        interrupted_download(sha256)
+        checks.append(('interrupted fresh download resumes', download(url, target, sha256) == 'resumed'))
+        checks.append(('unchanged file is skipped', download(url, target, sha256) == 'skipped'))
+
+        # 2. Source changes; the re-download is interrupted and must not be reported as current
+        time.sleep(0.01)
+        sha256 = write_source()
+        interrupted_download(sha256)
+        checks.append(('interrupted re-download is not skipped', not is_unchanged(url, target)))
+        status = download(url, target, sha256)
+        checks.append(('re-download completes', status in ('resumed', 'downloaded')))
+        checks.append(('checksum matches new file', file_sha256(target) == sha256))
+        checks.append(('no .part left behind', not os.path.exists(target + '.part')))
+    finally:
+        server.shutdown()
+
+    for name, ok in checks:
+        print(f"  {'ok  ' if ok else 'FAIL'} {name}")
+    return all(ok for _, ok in checks)
+
+
+def main():
+    print("Streaming File Downloader")
+    print("=" * 40)
+
+    # Generated test files go to a temporary directory that is removed afterwards
+    work_dir = tempfile.mkdtemp(prefix='downloader_')
+    source_dir = os.path.join(work_dir, 'generated')
+    target_dir = os.path.join(work_dir, 'downloaded')
+    os.makedirs(source_dir)
+
+    try:
+        # Generate a few large files to serve locally
+        jobs = []
+        server = serve_directory(source_dir)
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        for i, size_mb in enumerate([8, 16, 32, 64]):
+            name = f"file_{i}.bin"
+            path = os.path.join(source_dir, name)
+            with open(path, 'wb') as f:
+                for _ in range(size_mb):
+                    f.write(os.urandom(1024 * 1024))
+            jobs.append((f"{base_url}/{name}", os.path.join(target_dir, name), file_sha256(path)))
+
+        for label in ["First run", "Second run (should skip)"]:
+            print(f"\n{label}:")
+            start = time.perf_counter()
+            download_all(jobs)
+            print(f"  Took {time.perf_counter() - start:.2f}s")
+
+        server.shutdown()
+
+        print("\nInterrupt / resume check:")
+        interrupt_check(source_dir, target_dir)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
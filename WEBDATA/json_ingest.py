@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Streaming JSON Ingestion for API Payloads
+Parses large JSON responses incrementally and flattens nested fields
+(e.g. Fruityvice 'nutritions.*') straight into typed column buffers
+"""
+
+import json
+from array import array
+
+import numpy as np
+import pandas as pd
+import requests
+
+try:
+    import ijson
+except ImportError:
+    print("ijson not installed. Run: pip install ijson")
+    print("Falling back to parsing each JSON body in full (no streaming)")
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+FRUITYVICE_URL = "https://web.archive.org/web/20240929211114/https://fruityvice.com/api/fruit/all"
+
+
+def flatten_record(record, parent_key='', sep='.'):
+    """Flatten nested dicts the same way pd.json_normalize names columns"""
+    flat = {}
+    for key, value in record.items():
+        name = f"{parent_key}{sep}{key}" if parent_key else key
+        if isinstance(value, dict):
+            flat.update(flatten_record(value, name, sep))
+        else:
+            flat[name] = value
+    return flat
+
+
+class ColumnBuffers:
+    """
+    Column-oriented row accumulator.
+    Ints and floats go into compact array.array buffers; anything else
+    (strings, lists, mixed types) falls back to a plain Python list.
+    """
+
+    def __init__(self):
+        self.columns = {}
+        self.n_rows = 0
+
+    def _new_column(self, value):
+        if isinstance(value, bool) or value is None:
+            column = []
+        elif isinstance(value, int):
+            # Earlier rows are missing this field, so it needs NaN padding
+            column = array('q') if self.n_rows == 0 else array('d')
+        elif isinstance(value, float):
+            column = array('d')
+        else:
+            column = []
+        self._pad(column, self.n_rows)
+        return column
+
+    @staticmethod
+    def _pad(column, length):
+        missing = length - len(column)
+        if missing <= 0:
+            return
+        if isinstance(column, array):
+            column.extend([float('nan')] * missing)
+        else:
+            column.extend([None] * missing)
+
+    def _append(self, name, value):
+        column = self.columns[name]
+        if isinstance(column, array):
+            if column.typecode == 'q':
+                if isinstance(value, int) and not isinstance(value, bool):
+                    column.append(value)
+                    return
+                if isinstance(value, float) or value is None:
+                    # Promote to float so missing values can be NaN
+                    column = array('d', column)
+                    self.columns[name] = column
+            if column.typecode == 'd':
+                if value is None:
+                    column.append(float('nan'))
+                    return
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    column.append(float(value))
+                    return
+            # Anything else demotes the column to a generic list
+            column = list(column)
+            self.columns[name] = column
+        column.append(value)
+
+    def add(self, record):
+        """Append one flattened record"""
+        for name, value in record.items():
+            if name not in self.columns:
+                self.columns[name] = self._new_column(value)
+            self._append(name, value)
+        self.n_rows += 1
+        for name in list(self.columns):
+            if len(self.columns[name]) < self.n_rows:
+                self._append(name, None)
+
+    def to_frame(self):
+        """Build the DataFrame once, without copying numeric buffers through Python objects"""
+        data = {}
+        for name, column in self.columns.items():
+            if isinstance(column, array):
+                data[name] = np.frombuffer(column, dtype=np.int64 if column.typecode == 'q' else np.float64)
+            else:
+                data[name] = column
+        return pd.DataFrame(data)
+
+
+def parse_path():
+    """Which ingestion path iter_records() will take"""
+    if ijson is not None:
+        return "streamed (ijson)"
+    return f"full body ({'orjson' if orjson is not None else 'json'}) - install ijson to stream"
+
+
+def iter_records(source, prefix='item'):
+    """
+    Yield records from a file-like JSON source.
+    Uses ijson for true incremental parsing. Without it the whole body is read
+    and parsed at once with orjson (or the standard json module), which needs
+    several times the payload size in memory; see parse_path().
+    """
+    if ijson is not None:
+        for record in ijson.items(source, prefix, use_float=True):
+            yield record
+        return
+
+    raw = source.read()
+    payload = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    if prefix and prefix != 'item':
+        for key in prefix.split('.'):
+            if key != 'item':
+                payload = payload[key]
+    if isinstance(payload, dict):
+        payload = [payload]
+    for record in payload:
+        yield record
+
+
+def ingest_stream(source, prefix='item', columns=None):
+    """Flatten every record in a JSON source into a single DataFrame"""
+    buffers = ColumnBuffers()
+    for record in iter_records(source, prefix):
+        flat = flatten_record(record)
+        if columns is not None:
+            flat = {name: flat.get(name) for name in columns}
+        buffers.add(flat)
+    return buffers.to_frame()
+
+
+def ingest_url(url, prefix='item', columns=None, timeout=30):
+    """Stream a JSON API response into a DataFrame"""
+    with requests.get(url, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True
+        return ingest_stream(response.raw, prefix=prefix, columns=columns)
+
+
+def ingest_file(path, prefix='item', columns=None):
+    """Read a saved JSON payload into a DataFrame"""
+    with open(path, 'rb') as f:
+        return ingest_stream(f, prefix=prefix, columns=columns)
+
+
+def main():
+    print("Streaming JSON Ingestion")
+    print("=" * 40)
+    print(f"Parse path: {parse_path()}")
+
+    try:
+        df = ingest_url(FRUITYVICE_URL)
+    except Exception as e:
+        print(f"Error fetching data: {e}")
+        return
+
+    print(f"Loaded {len(df)} rows, {len(df.columns)} columns")
+    print(df.dtypes)
+    print(df[['name', 'nutritions.calories', 'nutritions.sugar']].head())
+
+
+if __name__ == "__main__":
+    main()
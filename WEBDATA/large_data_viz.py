@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+Large-Data Plotly Figure Builders
+Drop-in builders for the scatter, 3D scatter and animated bubble charts in
+fancy_interactive_viz_notebook.ipynb / python_visualization_notebook.ipynb that
+stay usable past ~50k points:
+
+- small inputs keep SVG traces (go.Scatter); larger ones switch to WebGL (go.Scattergl)
+- very large inputs are pre-binned: dense regions become a heatmap layer and only
+  points in sparse bins are drawn individually
+- animation frames carry only the per-frame x/y as float32 typed arrays; marker
+  styling lives once in the base trace, and shared_frames_html() ships all frames
+  as a single buffer that the browser slices into frame views
+"""
+
+import base64
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+try:
+    import plotly.graph_objects as go
+    import plotly.io as pio
+    from plotly.colors import qualitative
+except ImportError:
+    print("Plotly not installed. Run: pip install plotly")
+    raise
+
+WEBGL_THRESHOLD = 10_000     # above this many points use Scattergl
+BIN_THRESHOLD = 500_000      # above this many points pre-bin into a heatmap
+BINS = 200                   # heatmap resolution per axis
+VOXEL_BINS = 48              # 3D binning resolution per axis
+SPARSE_COUNT = 2             # bins with at most this many points are drawn as points
+MAX_SPARSE_POINTS = 50_000   # cap on individually drawn points in binned mode
+COLORSCALE = 'Viridis'
+PALETTE = qualitative.Plotly  # discrete colours for categorical color arrays
+
+
+def render_mode(n_points, webgl_threshold=WEBGL_THRESHOLD, bin_threshold=BIN_THRESHOLD):
+    """'svg', 'webgl' or 'binned' for a trace of n_points"""
+    if n_points > bin_threshold:
+        return 'binned'
+    if n_points > webgl_threshold:
+        return 'webgl'
+    return 'svg'
+
+
+def _as_float32(values):
+    return None if values is None else np.asarray(values, dtype=np.float32)
+
+
+def _drop_non_finite(*coords, weights=None):
+    """Remove points with a NaN/inf coordinate before binning"""
+    finite = np.logical_and.reduce([np.isfinite(values) for values in coords])
+    if finite.all():
+        return (*coords, weights)
+    return (*(values[finite] for values in coords), weights[finite] if weights is not None else None)
+
+
+def _edges(values, bins):
+    lo, hi = float(values.min()), float(values.max())
+    if hi <= lo:
+        hi = lo + 1.0
+    return lo, hi, np.linspace(lo, hi, bins + 1, dtype=np.float32)
+
+
+def _bin_index(values, lo, hi, bins):
+    index = ((values - lo) * (bins / (hi - lo))).astype(np.intp)
+    np.clip(index, 0, bins - 1, out=index)
+    return index
+
+
+def bin_points(x, y, bins=BINS, weights=None):
+    """
+    2D binning in one bincount pass (faster than np.histogram2d on 10M points).
+    Returns (x centers, y centers, counts[y, x], mean weight per bin or None, flat bin per point).
+    """
+    x_lo, x_hi, x_edges = _edges(x, bins)
+    y_lo, y_hi, y_edges = _edges(y, bins)
+    flat = _bin_index(y, y_lo, y_hi, bins) * bins + _bin_index(x, x_lo, x_hi, bins)
+
+    counts = np.bincount(flat, minlength=bins * bins)
+    mean = None
+    if weights is not None:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.bincount(flat, weights=weights, minlength=bins * bins) / counts
+
+    x_centers = (x_edges[:-1] + x_edges[1:]) / 2
+    y_centers = (y_edges[:-1] + y_edges[1:]) / 2
+    counts = counts.reshape(bins, bins)
+    if mean is not None:
+        mean = mean.reshape(bins, bins).astype(np.float32)
+    return x_centers, y_centers, counts, mean, flat
+
+
+def _sparse_points(flat, counts, sparse_count, max_points):
+    """Indices of points in sparse bins, thinned evenly to at most max_points"""
+    index = np.flatnonzero(counts.ravel()[flat] <= sparse_count)
+    if len(index) > max_points:
+        index = index[np.linspace(0, len(index) - 1, max_points).astype(np.intp)]
+    return index
+
+
+def _categories(color):
+    """(labels, codes) for a non-numeric color array such as df['category']; None otherwise"""
+    if color is None or isinstance(color, str):
+        return None
+    values = np.asarray(color)
+    if np.issubdtype(values.dtype, np.number):
+        return None
+    codes, labels = pd.factorize(values, use_na_sentinel=False)
+    return [str(label) for label in labels], codes
+
+
+def _marker_color(color, colorscale):
+    """
+    Marker color settings: numeric arrays use the colorscale, categorical arrays
+    get one palette colour per category, a single colour string is passed through
+    """
+    categories = _categories(color)
+    if categories is not None:
+        _, codes = categories
+        return dict(color=np.asarray(PALETTE)[codes % len(PALETTE)])
+    if color is None or isinstance(color, str):
+        return dict(color=color)
+    return dict(color=_as_float32(color), colorscale=colorscale, showscale=True)
+
+
+def _subset(value, mask, n_points):
+    """Per-point arrays are filtered with the points; scalars are shared"""
+    if value is None or isinstance(value, str) or np.ndim(value) == 0 or len(value) != n_points:
+        return value
+    return np.asarray(value)[mask]
+
+
+def scatter(x, y, color=None, size=None, mode='auto', text=None, title=None,
+            colorscale=COLORSCALE, bins=BINS, sparse_count=SPARSE_COUNT,
+            max_sparse_points=MAX_SPARSE_POINTS):
+    """
+    2D marker scatter that picks SVG, WebGL or binned rendering from the point count.
+    mode: 'auto', 'svg', 'webgl' or 'binned'. Per-point text is only kept in the
+    svg/webgl modes; for large inputs prefer a hovertemplate over a text array.
+
+    A numeric color uses the colorscale (and becomes the heatmap's per-bin mean in
+    binned mode). A categorical color (e.g. df['category']) draws one trace per
+    category with its own legend entry, like px.scatter(color='category'); in
+    binned mode the heatmap then shows point counts.
+    """
+    x, y = _as_float32(x), _as_float32(y)
+    n_points = len(x)
+    categories = _categories(color)
+    if mode == 'auto':
+        mode = render_mode(n_points)
+
+    fig = go.Figure()
+    if mode in ('svg', 'webgl'):
+        trace = go.Scatter if mode == 'svg' else go.Scattergl
+        if categories is not None:
+            labels, codes = categories
+            for k, label in enumerate(labels):
+                mask = codes == k
+                fig.add_trace(trace(
+                    x=x[mask], y=y[mask], mode='markers', name=label, text=_subset(text, mask, n_points),
+                    marker=dict(color=PALETTE[k % len(PALETTE)],
+                                size=_subset(size if size is not None else 4, mask, n_points)),
+                ))
+        else:
+            marker = dict(size=size if size is not None else 4, **_marker_color(color, colorscale))
+            fig.add_trace(trace(x=x, y=y, mode='markers', marker=marker, text=text))
+    elif mode == 'binned':
+        weights = None
+        if categories is None and color is not None and not isinstance(color, str):
+            weights = _as_float32(color)
+        codes = categories[1] if categories is not None else None
+        finite = np.isfinite(x) & np.isfinite(y)
+        if not finite.all():
+            x, y = x[finite], y[finite]
+            weights = weights[finite] if weights is not None else None
+            codes = codes[finite] if codes is not None else None
+        x_centers, y_centers, counts, mean, flat = bin_points(x, y, bins, weights)
+
+        dense = counts > sparse_count
+        z = np.where(dense, mean if mean is not None else counts, np.nan).astype(np.float32)
+        fig.add_trace(go.Heatmap(
+            x=x_centers, y=y_centers, z=z, colorscale=colorscale,
+            colorbar=dict(title='mean color' if mean is not None else 'points per bin'),
+            hovertemplate='x: %{x}<br>y: %{y}<br>value: %{z}<extra></extra>',
+        ))
+
+        sparse = _sparse_points(flat, counts, sparse_count, max_sparse_points)
+        if codes is not None:
+            for k, label in enumerate(categories[0]):
+                points = sparse[codes[sparse] == k]
+                fig.add_trace(go.Scattergl(
+                    x=x[points], y=y[points], mode='markers', name=label,
+                    marker=dict(size=3, color=PALETTE[k % len(PALETTE)], opacity=0.6),
+                ))
+        else:
+            fig.add_trace(go.Scattergl(
+                x=x[sparse], y=y[sparse], mode='markers', showlegend=False,
+                marker=dict(size=3, color=weights[sparse] if weights is not None else color or 'black',
+                            colorscale=colorscale, opacity=0.6),
+            ))
+    else:
+        raise ValueError(f"Unknown render mode '{mode}'")
+
+    fig.update_layout(title=title, template='plotly_white', meta={'render_mode': mode, 'points': len(x)})
+    return fig
+
+
+def voxel_bin(x, y, z, bins=VOXEL_BINS, weights=None):
+    """Occupied voxel centers, point counts and optional mean weight per voxel"""
+    axes = [_edges(values, bins) for values in (x, y, z)]
+    flat = np.zeros(len(x), dtype=np.intp)
+    for values, (lo, hi, _) in zip((x, y, z), axes):
+        flat = flat * bins + _bin_index(values, lo, hi, bins)
+
+    counts = np.bincount(flat, minlength=bins ** 3)
+    occupied = np.flatnonzero(counts)
+    centers = []
+    for position, (_, _, edges) in zip(np.unravel_index(occupied, (bins,) * 3), axes):
+        centers.append((edges[position] + edges[position + 1]) / 2)
+
+    mean = None
+    if weights is not None:
+        mean = (np.bincount(flat, weights=weights, minlength=bins ** 3)[occupied] / counts[occupied]).astype(np.float32)
+    return centers, counts[occupied], mean
+
+
+def scatter3d(x, y, z, color=None, size=None, mode='auto', title=None, colorscale=COLORSCALE,
+              bins=VOXEL_BINS):
+    """
+    3D marker scatter. Scatter3d is already WebGL, so the only switch is binning:
+    above BIN_THRESHOLD points are aggregated into voxels sized by point count.
+    Hover uses %{pointNumber} instead of a per-point text list. Categorical colors
+    get palette colours per point; binned voxels are then coloured by count.
+    """
+    x, y, z = _as_float32(x), _as_float32(y), _as_float32(z)
+    if mode == 'auto':
+        mode = 'binned' if render_mode(len(x)) == 'binned' else 'webgl'
+
+    if mode == 'binned':
+        weights = None
+        if _categories(color) is None and color is not None and not isinstance(color, str):
+            weights = _as_float32(color)
+        x, y, z, weights = _drop_non_finite(x, y, z, weights=weights)
+        (vx, vy, vz), counts, mean = voxel_bin(x, y, z, bins, weights)
+        scaled = np.log1p(counts)
+        marker_size = 2 + 10 * scaled / scaled.max()
+        trace = go.Scatter3d(
+            x=vx, y=vy, z=vz, mode='markers',
+            marker=dict(size=marker_size, color=mean if mean is not None else counts, colorscale=colorscale,
+                        opacity=0.8, showscale=True,
+                        colorbar=dict(title='mean color' if mean is not None else 'points per voxel')),
+            customdata=counts,
+            hovertemplate='X: %{x}<br>Y: %{y}<br>Z: %{z}<br>points: %{customdata}<extra></extra>',
+        )
+    elif mode == 'webgl':
+        trace = go.Scatter3d(
+            x=x, y=y, z=z, mode='markers',
+            marker=dict(size=size if size is not None else 3, opacity=0.8, **_marker_color(color, colorscale)),
+            hovertemplate='<b>Point %{pointNumber}</b><br>X: %{x}<br>Y: %{y}<br>Z: %{z}<extra></extra>',
+        )
+    else:
+        raise ValueError(f"Unknown 3D render mode '{mode}'")
+
+    fig = go.Figure(data=[trace])
+    fig.update_layout(title=title, meta={'render_mode': mode, 'points': len(x)},
+                      scene=dict(camera=dict(eye=dict(x=1.5, y=1.5, z=1.5))))
+    return fig
+
+
+def animated_scatter(x_frames, y_frames, labels=None, color=None, size=None, mode='auto',
+                     x_range=None, y_range=None, title=None, colorscale=COLORSCALE, duration=500):
+    """
+    Animated marker chart from (n_frames, n_points) arrays, e.g.
+    df.pivot(index='Year', columns='Country', values='GDP').
+
+    Both arrays are converted once into float32 blocks and every frame references
+    a row of them. Frames hold only x/y (serialized as typed arrays); color, size
+    and hover settings are defined once on the base trace instead of per frame.
+    """
+    x_frames = np.ascontiguousarray(x_frames, dtype=np.float32)
+    y_frames = np.ascontiguousarray(y_frames, dtype=np.float32)
+    if x_frames.shape != y_frames.shape or x_frames.ndim != 2:
+        raise ValueError("x_frames and y_frames must both have shape (n_frames, n_points)")
+    n_frames, n_points = x_frames.shape
+    labels = [str(label) for label in (labels if labels is not None else range(n_frames))]
+
+    if mode == 'auto':
+        mode = 'webgl' if render_mode(n_points, bin_threshold=float('inf')) == 'webgl' else 'svg'
+    trace = go.Scatter if mode == 'svg' else go.Scattergl
+    # SVG traces can tween between frames; WebGL traces must redraw
+    redraw = mode != 'svg'
+
+    if x_range is None:
+        x_range = [float(np.nanmin(x_frames)), float(np.nanmax(x_frames))]
+    if y_range is None:
+        y_range = [float(np.nanmin(y_frames)), float(np.nanmax(y_frames))]
+
+    categories = _categories(color)
+    hover = 'Point %{pointNumber}'
+    customdata = None
+    if categories is not None:
+        hover = '%{customdata}'
+        customdata = np.asarray(categories[0], dtype=object)[categories[1]]
+    base = trace(
+        x=x_frames[0], y=y_frames[0], mode='markers', customdata=customdata,
+        marker=dict(size=size, sizemode='area', **_marker_color(color, colorscale)),
+        hovertemplate=hover + '<br>x: %{x}<br>y: %{y}<extra></extra>',
+    )
+    frames = [
+        go.Frame(name=label, traces=[0], data=[trace(x=x_frames[i], y=y_frames[i])])
+        for i, label in enumerate(labels)
+    ]
+
+    frame_args = dict(frame=dict(duration=duration, redraw=redraw), mode='immediate',
+                      transition=dict(duration=0 if redraw else duration // 2))
+    fig = go.Figure(data=[base], frames=frames)
+    fig.update_layout(
+        title=title, template='plotly_white',
+        xaxis=dict(range=x_range), yaxis=dict(range=y_range),
+        meta={'render_mode': mode, 'points': n_points, 'frames': n_frames},
+        updatemenus=[dict(type='buttons', showactive=False, x=0.05, y=0, xanchor='right', yanchor='top',
+                          buttons=[
+                              dict(label='Play', method='animate', args=[None, dict(frame_args, fromcurrent=True)]),
+                              dict(label='Pause', method='animate',
+                                   args=[[None], dict(frame=dict(duration=0, redraw=False), mode='immediate')]),
+                          ])],
+        sliders=[dict(x=0.1, len=0.9, y=0, yanchor='top', steps=[
+            dict(label=label, method='animate', args=[[label], frame_args]) for label in labels
+        ])],
+    )
+    return fig
+
+
+_SHARED_FRAMES_JS = """
+(function() {
+    var gd = document.getElementById('{plot_id}');
+    var raw = atob('%(data)s');
+    var bytes = new Uint8Array(raw.length);
+    for (var i = 0; i < raw.length; i++) { bytes[i] = raw.charCodeAt(i); }
+    var block = new Float32Array(bytes.buffer);
+    var names = %(names)s, n = %(points)d, frames = [];
+    names.forEach(function(name, i) {
+        var start = 2 * i * n;
+        frames.push({name: name, traces: [0], data: [{
+            x: block.subarray(start, start + n),
+            y: block.subarray(start + n, start + 2 * n)
+        }]});
+    });
+    Plotly.addFrames(gd, frames);
+})();
+"""
+
+
+def shared_frames_html(fig, include_plotlyjs='cdn', full_html=True):
+    """
+    HTML for a figure from animated_scatter() where all frame coordinates are
+    stored once as a single float32 buffer. The browser decodes it once and
+    builds each frame from subarray views, so no frame data is duplicated.
+    """
+    names = [frame.name for frame in fig.frames]
+    n_points = len(fig.frames[0].data[0].x)
+    block = np.empty((len(names), 2, n_points), dtype=np.float32)
+    for i, frame in enumerate(fig.frames):
+        block[i, 0] = frame.data[0].x
+        block[i, 1] = frame.data[0].y
+
+    figure = {'data': [trace.to_plotly_json() for trace in fig.data], 'layout': fig.layout.to_plotly_json()}
+    script = _SHARED_FRAMES_JS % {
+        'data': base64.b64encode(block.tobytes()).decode('ascii'),
+        'names': json.dumps(names),
+        'points': n_points,
+    }
+    return pio.to_html(figure, include_plotlyjs=include_plotlyjs, full_html=full_html,
+                       validate=False, post_script=script)
+
+
+def sample_points(n, seed=42):
+    """Clustered test cloud: a few dense Gaussian blobs over a sparse uniform background"""
+    rng = np.random.default_rng(seed)
+    n_background = n // 20
+    centers = rng.uniform(-8, 8, size=(5, 2))
+    blob = rng.integers(0, len(centers), n - n_background)
+    points = np.concatenate([
+        centers[blob] + rng.normal(0, 0.8, size=(n - n_background, 2)),
+        rng.uniform(-10, 10, size=(n_background, 2)),
+    ])
+    x, y = points[:, 0], points[:, 1]
+    return x, y, np.sin(np.sqrt(x ** 2 + y ** 2))
+
+
+def _notebook_scatter(x, y, color):
+    """The notebooks' approach: one SVG go.Scatter over float64 arrays"""
+    return go.Figure(go.Scatter(x=x, y=y, mode='markers',
+                                marker=dict(color=color, colorscale=COLORSCALE, showscale=True)))
+
+
+def _measure(build):
+    start = time.perf_counter()
+    fig = build()
+    built = time.perf_counter() - start
+    start = time.perf_counter()
+    html = fig if isinstance(fig, str) else fig.to_html(include_plotlyjs='cdn')
+    return built, time.perf_counter() - start, len(html)
+
+
+def benchmark(sizes=(10_000, 1_000_000, 10_000_000), max_raw_points=1_000_000):
+    """Figure build time, HTML serialization time and HTML size per rendering mode"""
+    print(f"{'points':>12} {'mode':<16} {'build':>9} {'to_html':>9} {'html size':>11}")
+    for n in sizes:
+        x, y, color = sample_points(n)
+        candidates = [
+            ('notebook (svg)', lambda: _notebook_scatter(x, y, color)),
+            ('webgl', lambda: scatter(x, y, color, mode='webgl')),
+            ('auto', lambda: scatter(x, y, color)),
+        ]
+        for label, build in candidates:
+            if label != 'auto' and n > max_raw_points:
+                print(f"{n:>12,} {label:<16} skipped (more than {max_raw_points:,} raw points)")
+                continue
+            built, serialized, size = _measure(build)
+            if label == 'auto':
+                label = f"auto ({render_mode(n)})"
+            print(f"{n:>12,} {label:<16} {built:8.2f}s {serialized:8.2f}s {size / 2**20:9.2f} MB")
+
+    n_frames, n_points = 20, 10_000
+    print(f"\nAnimation: {n_frames} frames x {n_points:,} points")
+    rng = np.random.default_rng(0)
+    x_frames = np.cumsum(rng.normal(0, 0.1, size=(n_frames, n_points)), axis=0)
+    y_frames = np.cumsum(rng.normal(0, 0.1, size=(n_frames, n_points)), axis=0)
+    color = rng.uniform(0, 1, n_points)
+
+    def px_animation():
+        import pandas as pd
+        import plotly.express as px
+
+        df = pd.DataFrame({
+            'frame': np.repeat(np.arange(n_frames), n_points),
+            'id': np.tile(np.arange(n_points), n_frames),
+            'x': x_frames.ravel(), 'y': y_frames.ravel(),
+            'color': np.tile(color, n_frames),
+        })
+        return px.scatter(df, x='x', y='y', color='color', animation_frame='frame', animation_group='id')
+
+    candidates = [
+        ('plotly express', px_animation),
+        ('typed frames', lambda: animated_scatter(x_frames, y_frames, color=color)),
+        ('shared buffer', lambda: shared_frames_html(animated_scatter(x_frames, y_frames, color=color))),
+    ]
+    for label, build in candidates:
+        built, serialized, size = _measure(build)
+        print(f"{n_points:>12,} {label:<16} {built:8.2f}s {serialized:8.2f}s {size / 2**20:9.2f} MB")
+
+
+def main():
+    print("Large-Data Plotly Rendering")
+    print("=" * 40)
+    benchmark()
+
+
+if __name__ == "__main__":
+    main()
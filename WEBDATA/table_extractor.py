@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Targeted HTML Table Extractor
+Caches raw pages locally and parses only the table you actually need
+"""
+
+import hashlib
+import os
+import time
+from io import StringIO
+
+import pandas as pd
+import requests
+
+try:
+    import lxml.html
+except ImportError:
+    print("lxml not installed. Run: pip install lxml")
+    raise
+
+# Where raw HTML pages are cached between runs
+CACHE_DIR = "cache/html"
+
+# Saved copy of the GDP page used by the benchmark (download it once, then run offline)
+GDP_URL = "https://en.wikipedia.org/wiki/List_of_countries_by_GDP_(nominal)"
+GDP_SAVED_PAGE = "content/gdp_nominal.html"
+
+
+def cache_path(url, cache_dir=CACHE_DIR):
+    """Return the cache file used for a URL"""
+    digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir, f"{digest}.html")
+
+
+def fetch_html(url, cache_dir=CACHE_DIR, refresh=False, timeout=30):
+    """
+    Return the raw bytes of a page, downloading it only if it is not cached yet.
+    Local file paths are read directly and never cached.
+    """
+    if os.path.exists(url):
+        with open(url, 'rb') as f:
+            return f.read()
+
+    path = cache_path(url, cache_dir)
+    if not refresh and os.path.exists(path):
+        with open(path, 'rb') as f:
+            return f.read()
+
+    response = requests.get(url, timeout=timeout)
+    response.raise_for_status()
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = path + ".part"
+    with open(tmp_path, 'wb') as f:
+        f.write(response.content)
+    os.replace(tmp_path, path)
+
+    return response.content
+
+
+def _has_cells(table):
+    """pd.read_html skips tables that yield no rows; count only tables with cells"""
+    return bool(table.xpath('.//tr/td | .//tr/th'))
+
+
+def find_table(document, index=None, caption=None, css=None, xpath=None):
+    """
+    Locate a single <table> element in a parsed document.
+
+    Parameters:
+    - index: position among the non-empty tables on the page (same numbering as
+      pd.read_html, which drops tables without any <th>/<td> cells)
+    - caption: text the table <caption> must contain (case-insensitive)
+    - css: CSS selector (requires the cssselect package)
+    - xpath: XPath expression
+    If several locators are given they are applied in the order xpath, css, caption
+    and index is taken among the remaining matches.
+    """
+    if xpath is not None:
+        candidates = document.xpath(xpath)
+    elif css is not None:
+        try:
+            candidates = document.cssselect(css)
+        except ImportError:
+            raise ImportError("CSS selectors need cssselect. Run: pip install cssselect")
+    else:
+        candidates = document.xpath('//table')
+
+    # Selectors may land inside a table; walk up to the enclosing <table>
+    tables = []
+    for element in candidates:
+        while element is not None and getattr(element, 'tag', None) != 'table':
+            element = element.getparent()
+        if element is not None and element not in tables and _has_cells(element):
+            tables.append(element)
+
+    if caption is not None:
+        wanted = caption.lower()
+        tables = [
+            table for table in tables
+            if any(wanted in cap.text_content().lower() for cap in table.findall('caption'))
+        ]
+
+    if not tables:
+        raise ValueError("No table matched the given locator")
+
+    position = index if index is not None else 0
+    if position >= len(tables):
+        raise IndexError(f"Table index {position} out of range ({len(tables)} tables matched)")
+
+    return tables[position]
+
+
+def extract_table(url, index=None, caption=None, css=None, xpath=None,
+                  cache_dir=CACHE_DIR, refresh=False, **read_html_kwargs):
+    """
+    Return one table from a page as a DataFrame.
+    Only the selected <table> subtree is handed to pandas' lxml parser.
+    """
+    raw = fetch_html(url, cache_dir=cache_dir, refresh=refresh)
+    document = lxml.html.fromstring(raw)
+    table = find_table(document, index=index, caption=caption, css=css, xpath=xpath)
+
+    table_html = lxml.html.tostring(table, encoding='unicode')
+    return pd.read_html(StringIO(table_html), flavor='lxml', **read_html_kwargs)[0]
+
+
+def benchmark(page=GDP_SAVED_PAGE, index=2, repeats=5):
+    """Compare pd.read_html on the whole page with targeted extraction"""
+    if not os.path.exists(page):
+        print(f"Saved page '{page}' not found.")
+        print(f"Save a copy of {GDP_URL} there first.")
+        return None
+
+    with open(page, 'rb') as f:
+        raw = f.read()
+    print(f"Page size: {len(raw) / 1024:.0f} KB")
+
+    def full_parse():
+        return pd.read_html(StringIO(raw.decode('utf-8')), flavor='lxml')[index]
+
+    def targeted_parse():
+        return extract_table(page, index=index)
+
+    results = {}
+    shapes = []
+    for name, func in [('read_html (all tables)', full_parse), ('extract_table (one table)', targeted_parse)]:
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            df = func()
+            timings.append(time.perf_counter() - start)
+        results[name] = min(timings)
+        shapes.append(df.shape)
+        print(f"  {name:<28} best of {repeats}: {min(timings) * 1000:8.1f} ms  shape={df.shape}")
+
+    assert shapes[0] == shapes[1], f"Table {index} differs between methods: {shapes[0]} vs {shapes[1]}"
+    full, targeted = results.values()
+    if targeted > 0:
+        print(f"  Speedup: {full / targeted:.1f}x")
+    return results
+
+
+def main():
+    print("Targeted HTML Table Extractor")
+    print("=" * 40)
+    benchmark()
+
+
+if __name__ == "__main__":
+    main()
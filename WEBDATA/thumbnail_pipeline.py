@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Concurrent Image Fetch and Thumbnail Pipeline
+Fetches images over a pooled session with a thread pool, decodes and resizes
+them in a process pool using JPEG draft mode / reduce() to avoid full-size
+decodes, and stores thumbnails in a content-addressed on-disk cache
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from io import BytesIO
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from PIL import Image
+except ImportError:
+    print("Pillow not installed. Run: pip install pillow")
+    raise
+
+CACHE_DIR = "cache/thumbnails"
+THUMB_SIZE = (128, 128)
+FETCH_WORKERS = 16
+DECODE_WORKERS = None  # os.cpu_count()
+MAX_IN_FLIGHT = 64     # images between fetch start and decode end (bounds raw bytes in memory)
+TIMEOUT = 30
+
+
+def make_session(pool_size=FETCH_WORKERS):
+    """Session whose connection pool is large enough for every fetch thread"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def thumbnail_path(content_hash, size=THUMB_SIZE, cache_dir=CACHE_DIR):
+    """Cache location: <cache_dir>/<first 2 hex chars>/<sha256>_<w>x<h>.jpg"""
+    return os.path.join(cache_dir, content_hash[:2], f"{content_hash}_{size[0]}x{size[1]}.jpg")
+
+
+def make_thumbnail(data, size=THUMB_SIZE, cache_dir=CACHE_DIR):
+    """
+    Worker task: decode image bytes at reduced resolution and write the thumbnail.
+    Returns (content hash, cache path). Existing thumbnails are not re-rendered.
+    """
+    content_hash = hashlib.sha256(data).hexdigest()
+    path = thumbnail_path(content_hash, size, cache_dir)
+    if os.path.exists(path):
+        return content_hash, path
+
+    img = Image.open(BytesIO(data))
+    # JPEG: let libjpeg decode directly at 1/2, 1/4 or 1/8 scale
+    img.draft('RGB', size)
+    # Other formats: cheap integer box reduction down to ~2x the target before resampling
+    factor = min(img.width // (size[0] * 2), img.height // (size[1] * 2))
+    if factor > 1:
+        img = img.reduce(factor)
+    img = img.convert('RGB')
+    img.thumbnail(size, Image.LANCZOS)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    img.save(tmp_path, 'JPEG', quality=85)
+    os.replace(tmp_path, path)
+    return content_hash, path
+
+
+class ThumbnailCache:
+    """URL -> content hash index stored next to the thumbnails"""
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.index_path = os.path.join(cache_dir, 'index.json')
+        try:
+            with open(self.index_path, 'r') as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {}
+
+    def lookup(self, url, size=THUMB_SIZE):
+        content_hash = self.index.get(url)
+        if content_hash is None:
+            return None
+        path = thumbnail_path(content_hash, size, self.cache_dir)
+        return path if os.path.exists(path) else None
+
+    def save(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self.index_path, 'w') as f:
+            json.dump(self.index, f)
+
+
+def fetch(session, url, timeout=TIMEOUT):
+    response = session.get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.content
+
+
+def thumbnail_urls(urls, size=THUMB_SIZE, cache_dir=CACHE_DIR, fetch_workers=FETCH_WORKERS,
+                   decode_workers=DECODE_WORKERS, max_in_flight=MAX_IN_FLIGHT):
+    """
+    Fetch and thumbnail every URL. Downloads run in a thread pool; each finished
+    download is handed straight to the process pool so decoding overlaps fetching.
+    At most max_in_flight images are being fetched or decoded at once, so when
+    decoding falls behind, new fetches wait instead of piling raw bytes up in memory.
+    Returns ({url: thumbnail path or exception}, stats dict).
+    """
+    cache = ThumbnailCache(cache_dir)
+    results = {}
+    pending = []
+    for url in dict.fromkeys(urls):
+        cached = cache.lookup(url, size)
+        if cached:
+            results[url] = cached
+        else:
+            pending.append(url)
+
+    start = time.perf_counter()
+    fetched_bytes = 0
+    processed = 0
+    session = make_session(fetch_workers)
+    todo = iter(pending)
+
+    with ThreadPoolExecutor(max_workers=fetch_workers) as fetch_pool, \
+            ProcessPoolExecutor(max_workers=decode_workers) as decode_pool:
+        in_flight = {}  # future -> ('fetch' | 'decode', url)
+
+        def top_up():
+            while len(in_flight) < max_in_flight:
+                url = next(todo, None)
+                if url is None:
+                    return
+                in_flight[fetch_pool.submit(fetch, session, url)] = ('fetch', url)
+
+        top_up()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, url = in_flight.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    results[url] = e
+                    continue
+                if stage == 'fetch':
+                    fetched_bytes += len(result)
+                    in_flight[decode_pool.submit(make_thumbnail, result, size, cache_dir)] = ('decode', url)
+                else:
+                    content_hash, path = result
+                    cache.index[url] = content_hash
+                    results[url] = path
+                    processed += 1
+            top_up()
+
+    cache.save()
+    elapsed = time.perf_counter() - start
+    stats = {
+        'images': len(results),
+        'cached': len(results) - len(pending),
+        'processed': processed,
+        'errors': sum(isinstance(r, Exception) for r in results.values()),
+        'seconds': elapsed,
+        'images_per_sec': processed / elapsed if elapsed > 0 else None,
+        'bytes_fetched': fetched_bytes,
+    }
+    return results, stats
+
+
+def randomuser_picture_urls(n=100):
+    """Avatar URLs from the RandomUser API (as in FruityviceAndOthersAPI.ipynb)"""
+    from randomuser import RandomUser
+
+    return [user.get_picture() for user in RandomUser.generate_users(n)]
+
+
+def generate_test_images(directory, n=200, size=(1600, 1200)):
+    """Write n distinct JPEGs to directory (for the local throughput benchmark)"""
+    os.makedirs(directory, exist_ok=True)
+    names = []
+    for i in range(n):
+        name = f"img_{i:05d}.jpg"
+        path = os.path.join(directory, name)
+        if not os.path.exists(path):
+            color = ((i * 37) % 256, (i * 91) % 256, (i * 53) % 256)
+            Image.new('RGB', size, color).save(path, 'JPEG', quality=90)
+        names.append(name)
+    return names
+
+
+def benchmark(n=200):
+    """Throughput in images/sec against a local image server"""
+    from downloader import serve_directory
+
+    image_dir = tempfile.mkdtemp(prefix='images_')
+    cache_dir = tempfile.mkdtemp(prefix='thumbs_')
+    try:
+        names = generate_test_images(image_dir, n)
+        server = serve_directory(image_dir)
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        urls = [f"{base_url}/{name}" for name in names]
+
+        for label in ["Cold cache", "Warm cache"]:
+            results, stats = thumbnail_urls(urls, cache_dir=cache_dir)
+            rate = f"{stats['images_per_sec']:.1f} images/sec" if stats['processed'] else "all cached"
+            print(f"  {label}: {stats['images']} images in {stats['seconds']:.2f}s ({rate}), "
+                  f"{stats['errors']} errors, {stats['bytes_fetched'] / 2**20:.1f} MB fetched")
+        server.shutdown()
+    finally:
+        shutil.rmtree(image_dir, ignore_errors=True)
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def main():
+    print("Concurrent Image Thumbnail Pipeline")
+    print("=" * 40)
+    benchmark()
+
+
+if __name__ == "__main__":
+    main()